@@ -1,70 +1,50 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, eq=False)
 class PermissionListResponse:
-    def __init__(self, permissions: list = None):
-        self.permissions = permissions
+    permissions: list = None
 
 
+@dataclass(slots=True, eq=False)
 class GroupListResponse:
-    def __init__(self, groups: list = None):
-        self.groups = groups
+    groups: list = None
 
 
+@dataclass(slots=True, eq=False)
 class GroupRegistrationRequest:
-    def __init__(
-        self,
-        key: str,
-        name: str,
-        permissions: list,
-        description: str = None,
-        subgroups: list = None,
-        default: bool = None,
-    ):
-        self.key = key
-        self.name = name
-        self.permissions = permissions
-        self.description = description
-        self.subgroups = subgroups
-        self.default = default
+    key: str
+    name: str
+    permissions: list
+    description: str = None
+    subgroups: list = None
+    default: bool = None
 
 
+@dataclass(slots=True, eq=False)
 class GroupUpdateRequest:
-    def __init__(
-        self,
-        permissions: list,
-        description: str = None,
-        subgroups: list = None,
-        default: bool = None,
-    ):
-        self.permissions = permissions
-        self.description = description
-        self.subgroups = subgroups
-        self.default = default
+    permissions: list
+    description: str = None
+    subgroups: list = None
+    default: bool = None
 
 
+@dataclass(slots=True, eq=False)
 class UserListResponse:
-    def __init__(self, users: list = None):
-        self.users = users
+    users: list = None
 
 
+@dataclass(slots=True, eq=False)
 class UserRegistrationRequest:
-    def __init__(
-        self,
-        name: str,
-        password: str,
-        active: bool,
-        groups: list = None,
-        permissions: list = None,
-    ):
-        self.name = name
-        self.password = password
-        self.active = active
-        self.groups = groups
-        self.permissions = permissions
+    name: str
+    password: str
+    active: bool
+    groups: list = None
+    permissions: list = None
 
 
+@dataclass(slots=True, eq=False)
 class UserUpdateRequest:
-    def __init__(
-        self, active: bool = None, groups: list = None, permissions: list = None
-    ):
-        self.active = active
-        self.groups = groups
-        self.permissions = permissions
+    active: bool = None
+    groups: list = None
+    permissions: list = None
@@ -1,48 +1,344 @@
 from __future__ import annotations
+from functools import partial
+import json
+import threading
 import requests
-import urllib
-from requests_toolbelt.utils import dump
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.retry import Retry
 from .exceptions import handle_http_exception
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+else:
+    try:
+        from ujson import loads as _loads
+    except ImportError:
+        _loads = None
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# methods safe to send again after a failure: retried by the adapter, and
+# failed over to another base url whatever the connection error
+_IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE"])
+
+
+def _json_body(obj) -> bytes:
+    """
+    Encode `obj` as a json request body, with `orjson` when installed.
+    Non-str dict keys are converted to str, as `json.dumps` does, and
+    anything `orjson` cannot encode falls back to `json.dumps`. Note that
+    `orjson` encodes NaN and infinities as null.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode()
+
+
+def _new_session(api_key: str, pool_maxsize: int) -> requests.Session:
+    """
+    Create a session sending `api_key` with every request, over a pooled
+    adapter that retries transient errors.
+    """
+    session = requests.Session()
+    session.headers["X-Api-Key"] = api_key
+    adapter = HTTPAdapter(
+        pool_connections=pool_maxsize,
+        pool_maxsize=pool_maxsize,
+        pool_block=False,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=_IDEMPOTENT_METHODS,
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _is_connect_error(error: requests.ConnectionError) -> bool:
+    """
+    Whether `error` happened before the connection was established, i.e.
+    before any part of the request reached the server.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, "reason", reason)
+    return isinstance(reason, NewConnectionError)
+
+
+def _cached_response(not_modified: requests.Response, cached: tuple) -> requests.Response:
+    """
+    Build the 200 response a 304 `not_modified` stands for, from the cached
+    `(etag, body, headers)` of the response it revalidated.
+    """
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.reason = "OK"
+    resp.headers = requests.structures.CaseInsensitiveDict(cached[2])
+    resp._content = cached[1]
+    resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+    resp.url = not_modified.url
+    resp.request = not_modified.request
+    resp.elapsed = not_modified.elapsed
+    resp.connection = not_modified.connection
+    return resp
+
+
+class _ThreadLocalSessions:
+    """
+    Stands in for a `requests.Session`, lazily creating one session per
+    thread with `factory` so threads never contend for a connection pool.
+    """
+
+    def __init__(self, factory: callable):
+        self._factory = factory
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    def current(self) -> requests.Session:
+        """
+        Return the session of the calling thread, creating it if needed.
+        """
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._factory()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def request(self, *args, **kwargs) -> requests.Response:
+        return self.current().request(*args, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+
 
 class BaseClient:
     """
     Defines an abstract client-like object used for making requests to
     the octoprint server.
+
+    Method calls are thread-safe: requests share one `requests.Session`,
+    whose connection pool hands each thread its own connection. Heavily
+    threaded scripts can pass `thread_local_sessions=True` to give every
+    thread a session and pool of its own instead.
     """
 
+    __slots__ = (
+        "_api_key", "_base_url", "_url_prefixes", "_session", "_etag_cache", "_lock",
+    )
+
+    # number of GET responses carrying an `ETag` kept for revalidation
+    etag_cache_size = 128
+
     def __init__(
         self,
         base_url: str = None,
         api_key: str = None,
         parent_client: BaseClient | None = None,
+        fallback_base_urls: list = None,
+        pool_maxsize: int = 10,
+        thread_local_sessions: bool = False,
     ):
         if parent_client:
-            api_key = parent_client._api_key
-            base_url = parent_client._base_url
-        elif api_key is None or base_url is None:
+            self._attach(parent_client)
+            return
+        if api_key is None or base_url is None:
             raise TypeError("Missing `base_url`/`api_key` pair or `parent_client` argument")
+        if thread_local_sessions:
+            session = _ThreadLocalSessions(partial(_new_session, api_key, pool_maxsize))
+        else:
+            session = _new_session(api_key, pool_maxsize)
         self._api_key = api_key
         self._base_url = base_url
+        self._url_prefixes = [
+            url.rstrip("/") + "/" for url in [base_url, *(fallback_base_urls or ())]
+        ]
+        self._session = session
+        self._etag_cache = {}
+        # guards `_etag_cache` and `_url_prefixes`, shared with every attached client
+        self._lock = threading.Lock()
+
+    def _attach(self, parent_client: BaseClient):
+        """
+        Share the connection settings and session of `parent_client`.
+        """
+        self._api_key = parent_client._api_key
+        self._base_url = parent_client._base_url
+        self._url_prefixes = parent_client._url_prefixes
+        self._session = parent_client._session
+        self._etag_cache = parent_client._etag_cache
+        self._lock = parent_client._lock
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_session(self) -> requests.Session:
+        """
+        Return the `requests.Session` used for requests to OctoPrint, e.g. to
+        mount a different transport adapter. The session is shared with any
+        object created from this client. With `thread_local_sessions`, this
+        is the calling thread's session.
+        """
+        if isinstance(self._session, _ThreadLocalSessions):
+            return self._session.current()
+        return self._session
+
+    def close(self):
+        """
+        Close the underlying http session and its pooled connections. The
+        session is shared with any object created from this client.
+        """
+        self._session.close()
 
     @handle_http_exception
     def _make_request(self, endpoint: str, method: str = "GET", **kwargs):
         """
         make request to Octoprint with `self._api_key` included
-        in `X-Api-Key` header.
+        in `X-Api-Key` header, which is set once on the session.
+        Any `headers` passed are merged over the session headers.
+
+        Non-streamed GETs go through `_cached_get`; streamed ones are never
+        cached or revalidated. Any other method drops
+        the cached responses of the resource it targets. A `json` body is
+        encoded with `_json_body` when `orjson` is installed.
+        """
+        path = endpoint.lstrip("/")
+        if orjson is not None and kwargs.get("json") is not None:
+            kwargs["data"] = _json_body(kwargs.pop("json"))
+            kwargs["headers"] = {**(kwargs.get("headers") or {}), **_JSON_HEADERS}
+        if method != "GET":
+            self._invalidate_etags(path)
+        elif not kwargs.get("stream"):
+            return self._cached_get(path, **kwargs)
+        resp = self._send(method, path, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def _send(self, method: str, path: str, **kwargs) -> requests.Response:
+        """
+        Send a request for `path` to the base url, failing over to each of the
+        `fallback_base_urls` in turn on a connection error. Other methods than
+        `_IDEMPOTENT_METHODS` only fail over when the connection could not be
+        established, as a host that dropped it may already have acted on the
+        request. Retries of transient errors against one host are left to the
+        session's adapter. A fallback that succeeds is moved first, so later
+        requests from any object sharing the session go to it directly.
+        """
+        with self._lock:
+            prefixes = tuple(self._url_prefixes)
+        for i, prefix in enumerate(prefixes):
+            try:
+                resp = self._session.request(method, prefix + path, **kwargs)
+            except requests.ConnectionError as e:
+                if i == len(prefixes) - 1 or not (
+                    method in _IDEMPOTENT_METHODS or _is_connect_error(e)
+                ):
+                    raise
+                continue
+            if i:
+                with self._lock:
+                    current = self._url_prefixes
+                    current[:] = [prefix, *(p for p in current if p != prefix)]
+            return resp
+
+    def _make_request_noresp(self, endpoint: str, method: str = "POST", **kwargs):
+        """
+        Make a request whose response body is not used. The body is streamed
+        and discarded instead of being buffered on a `Response`, and the
+        connection is returned to the pool.
+        """
+        resp = self._make_request(endpoint, method, stream=True, **kwargs)
+        resp.raw.drain_conn()
+        resp.raw.release_conn()
+
+    def _cached_get(self, path: str, params: dict = None, **kwargs):
+        """
+        GET `path`, revalidating the last body seen for the same path, `params`
+        and `Accept` header with `If-None-Match` when its response carried an
+        `ETag`. An unchanged resource is answered with a bodyless 304, for
+        which a response is rebuilt from the cached body and headers. A 304
+        for which no body is cached (e.g. evicted by another thread) is
+        retried without `If-None-Match`.
         """
-        if "headers" in kwargs.keys():
-            headers = dict(kwargs.pop("headers"))
-            headers["X-Api-Key"] = self._api_key
+        cache = self._etag_cache
+        headers = kwargs.pop("headers", None) or {}
+        accept = next((v for k, v in headers.items() if k.lower() == "accept"), None)
+        if accept is None:
+            accept = self.get_session().headers.get("Accept")
+        key = (path, tuple(sorted(params.items())) if params else (), accept)
+        with self._lock:
+            cached = cache.get(key)
+        if cached is not None:
+            resp = self._send(
+                "GET", path, params=params, headers={**headers, "If-None-Match": cached[0]},
+                **kwargs,
+            )
+            if resp.status_code == 304:
+                with self._lock:
+                    if cache.pop(key, None) is not None:
+                        cache[key] = cached
+                return _cached_response(resp, cached)
         else:
-            headers = {
-                "X-Api-Key": self._api_key,
-            }
-        url = urllib.parse.urljoin(self._base_url, endpoint)
-        resp = requests.request(method, url, headers=headers, **kwargs)
+            resp = self._send("GET", path, params=params, headers=headers, **kwargs)
+            if resp.status_code == 304:
+                headers = {k: v for k, v in headers.items() if k.lower() != "if-none-match"}
+                resp = self._send("GET", path, params=params, headers=headers, **kwargs)
         resp.raise_for_status()
+        etag = resp.headers.get("ETag")
+        if etag is not None:
+            with self._lock:
+                cache.pop(key, None)
+                cache[key] = (etag, resp.content, dict(resp.headers))
+                while len(cache) > self.etag_cache_size:
+                    cache.pop(next(iter(cache)))
         return resp
 
+    def _invalidate_etags(self, path: str):
+        """
+        Drop cached GET bodies for the resource `path` belongs to, e.g. any
+        `api/files` response for a request to `api/files/local/a`. Paths are
+        matched by whole segments, so `api/printer` leaves `api/printerprofiles`.
+        """
+        resource = "/".join(path.strip("/").split("/", 2)[:2])
+        prefix = resource + "/"
+        cache = self._etag_cache
+        with self._lock:
+            for key in [k for k in cache if k[0] == resource or k[0].startswith(prefix)]:
+                del cache[key]
+
+    @staticmethod
+    def _json(resp: requests.Response):
+        """
+        Decode the json body of `resp`. Uses `orjson`, else `ujson`, directly
+        on the raw response bytes when installed, else falls back to
+        `resp.json()`.
+        """
+        if _loads is None:
+            return resp.json()
+        return _loads(resp.content)
+
     def _connection_settings(self):
         """
         Retrieve Octoprint connection settings.
@@ -55,4 +351,4 @@ class BaseClient:
         - method: `GET`
         """
         resp = self._make_request("/api/connection")
-        return resp.json()
+        return self._json(resp)
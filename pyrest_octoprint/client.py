@@ -1,11 +1,15 @@
 import requests
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from . import printerprofiles, printer, files, system
+from . import printerprofiles, printer, files, languages
 from .printer import Printer
 from .base import BaseClient
 
-from requests_toolbelt.utils import dump
+_CORE_COMMAND_PREFIX = "/api/system/commands/core/"
+_CUSTOM_COMMAND_PREFIX = "/api/system/commands/custom/"
+_UNSELECT_PAYLOAD = {"command": "unselect"}
 
 
 class Client(BaseClient):
@@ -14,6 +18,23 @@ class Client(BaseClient):
     the octoprint server.
     """
 
+    # seconds for which `get_file` reuses a listing already fetched for the
+    # same path and location; 0 always fetches a fresh listing.
+    file_lookup_ttl = 2.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._listings = {}
+
+    def _invalidate_etags(self, path: str):
+        """
+        Also drop the listings `get_file` reuses on any change to files, e.g.
+        a `File.move_into` or `delete` made through this client.
+        """
+        super()._invalidate_etags(path)
+        if path.strip("/").startswith("api/files"):
+            self._listings.clear()
+
     def server_version(self):
         """
         Retrieve Octoprint version information.
@@ -22,7 +43,7 @@ class Client(BaseClient):
         - method: `GET`
         """
         resp = self._make_request("/api/version")
-        return resp.json()
+        return self._json(resp)
 
     def connection_info(self):
         """
@@ -32,7 +53,7 @@ class Client(BaseClient):
         - method: `GET`
         """
         resp = self._make_request("/api/server")
-        return resp.json()
+        return self._json(resp)
 
     def connection_settings(self):
         """
@@ -92,7 +113,7 @@ class Client(BaseClient):
         - method: POST
         """
         data = {"command": "disconnect"}
-        resp = self._make_request("/api/connection", "POST", json=data)
+        self._make_request_noresp("/api/connection", "POST", json=data)
 
     def get_files(
         self,
@@ -105,7 +126,10 @@ class Client(BaseClient):
         Retrieve information regarding files currently available and
         regarding the disk space still available locally in either the
         `local` or `sdcard` storage. The results are cached for performance
-        reasons.
+        reasons. Storage root listings are parsed incrementally while they
+        are downloaded when `ijson` is installed; their bodies are then never
+        kept, so they are not revalidated with `ETag` like other GETs and are
+        always downloaded in full.
 
         params:
             override_cache (bool): override cache on request
@@ -118,14 +142,15 @@ class Client(BaseClient):
             "force": override_cache,
             "recursive": recursive,
         }
-        url = "/api/files"
         if location not in ["local", "sdcard"]:
             raise ValueError("`location` argument must be one of ['local', 'sdcard']")
-        url += f"/{location}"
-        if path is not None:
-            url = os.path.join(url, path)
+        url = "/".join(filter(None, ("/api/files", location, path)))
+        if path is None and files.ijson is not None:
+            with self._make_request(url, params=params, stream=True) as resp:
+                resp.raw.decode_content = True
+                return files.RetrieveResponse.from_stream(resp.raw, parent_client=self)
         resp = self._make_request(url, params=params)
-        return files.RetrieveResponse(**(resp.json()), parent_client=self)
+        return files.RetrieveResponse.from_dict(self._json(resp), parent_client=self)
 
     def get_file(
         self,
@@ -137,7 +162,10 @@ class Client(BaseClient):
     ):
         """
         Similar to `self.get_files`, but returns the specified `File` object
-        with a name of `filename`.
+        with a name of `filename`. Listings are reused for `file_lookup_ttl`
+        seconds, so looking up several files in the same folder only fetches
+        it once. Changes not made through this client may take up to that
+        long to show.
 
         params:
             override_cache (bool): override cache on request
@@ -146,17 +174,52 @@ class Client(BaseClient):
 
         Returns a File object if it exists, else None.
         """
-        retrieve_response = self.get_files(path, override_cache, recursive, location)
-        for f in retrieve_response.files:
-            if f.name == filename:
+        key = (path, recursive, location)
+        now = time.monotonic()
+        cached = self._listings.get(key)
+        if not override_cache and cached is not None and cached[0] > now:
+            f = cached[1]._by_name.get(filename)
+            if f is not None and not f._deleted:
                 return f
-        return None
+        retrieve_response = self.get_files(path, override_cache, recursive, location)
+        self._listings[key] = (now + self.file_lookup_ttl, retrieve_response)
+        return retrieve_response._by_name.get(filename)
+
+    def get_files_map(self, path: str = None, location: str = "local") -> dict:
+        """
+        Retrieve every file below `path` in a single recursive request and
+        return them as a flat dictionary keyed by their path within `location`.
+        Serves any number of lookups with one round trip.
+
+        params:
+            path (str): Optional, path to folder within `location` to list.
+            location (str): either `local` (uploads folder) or `sdcard`
+
+        Returns a dict of path (str) to File objects.
+        """
+        retrieve_response = self.get_files(path, recursive=True, location=location)
+        files_map = {}
+        stack = list(reversed(retrieve_response.files or []))
+        while stack:
+            entry = stack.pop()
+            if isinstance(entry, files.Folder):
+                stack.extend(reversed(entry.children))
+            else:
+                files_map[entry.path] = entry
+        return files_map
 
     def upload_file(
-        self, file, path: str = "/", location: str = "local"
+        self,
+        file,
+        path: str = "/",
+        location: str = "local",
+        select: bool = False,
+        print_now: bool = False,
+        progress=None,
     ):
         """
-        Upload a file to the selected `location`.
+        Upload a file to the selected `location`. The multipart body is
+        streamed from `file` in chunks rather than read into memory.
 
         - endpoint: `/api/files`
         - method: `POST`
@@ -165,13 +228,77 @@ class Client(BaseClient):
             file (file-like): actual file object to upload (bytes object)
             path (str): path to parent folder within `location` for upload.
             location (str): full path location to upload file to
+            select (bool): select the file for printing once uploaded
+            print_now (bool): start printing the file once uploaded, implies
+                `select`
+            progress (callable): Optional, called with a
+                `requests_toolbelt.MultipartEncoderMonitor` as the body is sent
         """
         if location not in ["local", "sdcard"]:
             raise ValueError("`location` path must be either 'local' or 'sdcard'")
         url = "/api/files/" + location + (path if path not in ["/", None] else "")
-        files_data = {"file": file}
-        resp = self._make_request(url, "POST", files=files_data)
-        return self.get_file(os.path.basename(file.name), path=(path if path not in ["/", None] else None), override_cache=True, location=location)
+        fields = {}
+        if select or print_now:
+            fields["select"] = "true"
+        if print_now:
+            fields["print"] = "true"
+        fields["file"] = (
+            os.path.basename(file.name), file, "application/octet-stream"
+        )
+        from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+
+        encoder = MultipartEncoder(fields=fields)
+        if progress is not None:
+            encoder = MultipartEncoderMonitor(encoder, progress)
+        resp = self._make_request(
+            url,
+            "POST",
+            data=encoder,
+            headers={"Content-Type": encoder.content_type},
+        )
+        return files.UploadResponse.from_dict(self._json(resp)).created(self, location)
+
+    def upload_and_select(
+        self, file, path: str = "/", location: str = "local", print_now: bool = False
+    ):
+        """
+        Upload a file and select it for printing (optionally starting the print)
+        in the same request, rather than uploading and then selecting.
+
+        - endpoint: `/api/files`
+        - method: `POST`
+
+        params:
+            file (file-like): actual file object to upload (bytes object)
+            path (str): path to parent folder within `location` for upload.
+            location (str): full path location to upload file to
+            print_now (bool): start printing the file once uploaded
+        """
+        return self.upload_file(file, path, location, select=True, print_now=print_now)
+
+    def upload_files(
+        self, files_iter, path: str = "/", location: str = "local", max_workers: int = 8
+    ) -> list:
+        """
+        Upload several files to the selected `location` concurrently, over
+        the connection pool of the client's session.
+
+        - endpoint: `/api/files`
+        - method: `POST`
+
+        params:
+            files_iter (iterable): file-like objects to upload
+            path (str): path to parent folder within `location` for upload.
+            location (str): full path location to upload files to
+            max_workers (int): maximum number of uploads in flight; keep it
+                within the session's `pool_maxsize`
+
+        Returns a list of the uploaded `File` objects, in the order of `files_iter`.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(
+                executor.map(lambda f: self.upload_file(f, path, location), files_iter)
+            )
 
     def new_folder(self, foldername: str, path: str = None):
         """
@@ -193,7 +320,7 @@ class Client(BaseClient):
             data={"foldername": foldername},
             files={},
         )
-        return self.get_file(foldername, path=(path if path not in ["/", None] else None), override_cache=True)
+        return files.UploadResponse.from_dict(self._json(resp)).created(self)
 
     def unselect_file(self, location="local/", path="current"):
         """
@@ -202,14 +329,9 @@ class Client(BaseClient):
         - endpoint: `/api/files/<location>/<path>`
         - method: `POST`
         """
-        resp = self._make_request(
-            "/api/files/" + location + path,
-            "POST",
-            json={
-                "command": "unselect",
-            },
+        self._make_request_noresp(
+            "/api/files/" + location + path, "POST", json=_UNSELECT_PAYLOAD
         )
-        return resp.json
 
     def retrieve_profile(self, profile: str = None) -> printerprofiles.Profile:
         """
@@ -223,7 +345,7 @@ class Client(BaseClient):
         if profile:
             url += f"/{profile}"
         resp = self._make_request(url)
-        return printerprofiles.Profile(**(resp.json()), parent_client=self)
+        return printerprofiles.Profile(**(self._json(resp)), parent_client=self)
 
     def add_profile(self, profile, based_on=None) -> printerprofiles.Profile:
         """
@@ -235,11 +357,11 @@ class Client(BaseClient):
         - method: `POST`
         """
         if based_on:
-            if type(based_on) == printerprofiles.Profile:
+            if isinstance(based_on, printerprofiles.Profile):
                 based_on = based_on.id
             else:
                 based_on = str(based_on)
-        if type(profile) == printerprofiles.Profile:
+        if isinstance(profile, printerprofiles.Profile):
             profile = profile.to_dict()
         else:
             profile = dict(profile)
@@ -247,7 +369,7 @@ class Client(BaseClient):
         if based_on:
             data["basedOn"] = based_on
         resp = self._make_request("/api/printerprofiles", "POST", json=data)
-        return printerprofiles.Profile(**(resp.json().get("profile")), parent_client=self)
+        return printerprofiles.Profile(**(self._json(resp).get("profile")), parent_client=self)
 
     def list_system_commands(self, source: str = None) -> list:
         """
@@ -259,13 +381,15 @@ class Client(BaseClient):
         params:
             source (str): either 'core', 'custom', or None for both.
         """
+        from . import system
+
         url = "/api/system/commands"
         if source:
             if source not in ["core", "custom"]:
                 raise ValueError("`source` must be one of 'core', 'custom', or None")
             url += "/" + source
         resp = self._make_request(url)
-        resp_data = resp.json()
+        resp_data = self._json(resp)
         if source:
             return [system.CommandDefinition(**x) for x in resp_data]
         else:
@@ -290,9 +414,8 @@ class Client(BaseClient):
             action (str): command name
             custom_command (bool): is `action` a custom command?
         """
-        url = "/api/system/commands/" + ("custom/" if custom_command else "core/")
-        url += str(action)
-        self._make_request(url, "POST")
+        prefix = _CUSTOM_COMMAND_PREFIX if custom_command else _CORE_COMMAND_PREFIX
+        self._make_request_noresp(prefix + str(action), "POST")
 
     def settings(self):
         """
@@ -302,7 +425,7 @@ class Client(BaseClient):
         - method: `GET`
         """
         resp = self._make_request("/api/settings")
-        return resp.json()
+        return self._json(resp)
 
     def set_settings(self, values: dict):
         """
@@ -317,7 +440,7 @@ class Client(BaseClient):
             values (dict): a dictionary of settings value following the [partial] structure
                 of OctoPrint's `config.yml` file.
         """
-        self._make_request("/api/settings", "POST", json=values)
+        self._make_request_noresp("/api/settings", "POST", json=values)
 
     def regenerate_api_key(self) -> str:
         """
@@ -330,7 +453,7 @@ class Client(BaseClient):
         any of the api keys within python client-like objects.
         """
         resp = self._make_request("/api/settings/apikey", "POST")
-        return resp.json().get("apikey")
+        return self._json(resp).get("apikey")
 
     def language_packs(self) -> list:
         """
@@ -343,7 +466,7 @@ class Client(BaseClient):
         """
         resp = self._make_request("/api/languages")
         return [
-            languages.ComponentList(**x) for x in resp.json().get("language_packs", [])
+            languages.ComponentList(**x) for x in self._json(resp).get("language_packs", [])
         ]
 
     def upload_language_pack(self, filename: str, file) -> list:
@@ -362,15 +485,10 @@ class Client(BaseClient):
         Returns a list of `languages.ComponentList` objects.
         """
         resp = self._make_request(
-            url,
-            "POST",
-            files={
-                "files": (filename, file),
-                "path": (None, path),
-            },
+            "/api/languages", "POST", files={"file": (filename, file)}
         )
         return [
-            languages.ComponentList(**x) for x in resp.json().get("language_packs", [])
+            languages.ComponentList(**x) for x in self._json(resp).get("language_packs", [])
         ]
 
     def delete_language_pack(self, locale: str, pack: str = "_core") -> list:
@@ -390,5 +508,5 @@ class Client(BaseClient):
         """
         resp = self._make_request(f"/api/languages/{locale}/{pack}", "DELETE")
         return [
-            languages.ComponentList(**x) for x in resp.json().get("language_packs", [])
+            languages.ComponentList(**x) for x in self._json(resp).get("language_packs", [])
         ]
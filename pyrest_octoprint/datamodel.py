@@ -1,8 +1,17 @@
+from dataclasses import dataclass
+from weakref import WeakValueDictionary
+
+
+@dataclass(slots=True, eq=False)
 class TemperatureData:
-    def __init__(self, actual: float, target: float, offset: float = None):
-        self.actual = float(actual)
-        self.target = float(target)
-        self.offset = float(offset) if offset else None
+    actual: float
+    target: float
+    offset: float = None
+
+    def __post_init__(self):
+        self.actual = float(self.actual)
+        self.target = float(self.target)
+        self.offset = float(self.offset) if self.offset else None
 
     def __str__(self):
         return str({"actual": self.actual, "target": self.target, "offset": self.offset})
@@ -11,33 +20,26 @@ class TemperatureData:
         return {"actual": self.actual, "target": self.target, "offset": self.offset}
 
 
+@dataclass(slots=True, eq=False)
 class TemperatureOffset:
-    def __init__(self, tool: list = None, bed: float = None):
-        self.tool = tool
-        self.bed = bed
+    tool: list = None
+    bed: float = None
 
 
+@dataclass(slots=True, eq=False)
 class ResendStats:
-    def __init__(self, count: int, transmitted: int, ratio: int):
-        self.count = count
-        self.transmitted = transmitted
-        self.ratio = ratio
+    count: int
+    transmitted: int
+    ratio: int
 
 
+@dataclass(slots=True, eq=False)
 class ProgressInformation:
-    def __init__(
-        self,
-        completion: float,
-        filepos: int,
-        printTime: int,
-        printTimeLeft: int,
-        printTimeLeftOrigin: str,
-    ):
-        self.completion = completion
-        self.filepos = filepos
-        self.printTime = printTime
-        self.printTimeLeft = printTimeLeft
-        self.printTimeLeftOrigin = printTimeLeftOrigin
+    completion: float
+    filepos: int
+    printTime: int
+    printTimeLeft: int
+    printTimeLeftOrigin: str
 
     def __str__(self):
         return str(self.to_dict())
@@ -57,6 +59,15 @@ class GcodeAnalysisInformation:
     Represents analysis information for a specific gcode file.
     """
 
+    __slots__ = (
+        "estimatedPrintTime",
+        "filament",
+        "dimensions",
+        "printingArea",
+        "travelArea",
+        "travelDimensions",
+    )
+
     def __init__(
         self,
         estimatedPrintTime: float = None,
@@ -67,98 +78,133 @@ class GcodeAnalysisInformation:
         travelDimensions: dict = None,
         **kwargs,
     ):
-        self.estimatedPrintTime = (
-            float(estimatedPrintTime) if estimatedPrintTime else None
-        )
-        self.filament = dict(filament) if filament else None
-        self.dimensions = dict(dimensions) if dimensions else None
-        self.printingArea = dict(printingArea) if printingArea else None
-        self.travelArea = dict(travelArea) if travelArea else None
-        self.travelDimensions = dict(travelDimensions) if travelDimensions else None
+        self.estimatedPrintTime = estimatedPrintTime
+        self.filament = filament
+        self.dimensions = dimensions
+        self.printingArea = printingArea
+        self.travelArea = travelArea
+        self.travelDimensions = travelDimensions
 
 
+@dataclass(slots=True, eq=False)
 class PrintHistory:
-    def __init__(self, success: float, failure: float, last: dict = None):
-        self.success = float(success)
-        self.failure = float(failure)
-        self.last = dict(last) if last else None
+    success: float
+    failure: float
+    last: dict = None
+
+    def __post_init__(self):
+        self.success = float(self.success)
+        self.failure = float(self.failure)
+        self.last = dict(self.last) if self.last else None
 
 
+@dataclass(slots=True, eq=False)
 class PrintStatistics:
-    def __init__(self, averagePrintTime: dict, lastPrintTime: dict):
-        self.averagePrintTime = averagePrintTime
-        self.lastPrintTime = lastPrintTime
+    averagePrintTime: dict
+    lastPrintTime: dict
 
 
-class Needs:
-    def __init__(self, role: list = None, group: list = None):
-        self.role = role
-        self.group = group
+_needs_cache = WeakValueDictionary()
 
 
+def _as_tuple(names: list) -> tuple:
+    """
+    Return the role or group names `names` as a tuple, or None if missing.
+    """
+    if names is None:
+        return None
+    return tuple(names)
+
+
+@dataclass(frozen=True, eq=False)
+class Needs:
+    """
+    Roles and groups required for a permission, user or group. Instances
+    are immutable, hold `role` and `group` as tuples, and are shared through
+    `Needs.get`: every record with the same needs refers to one object.
+    Records built from json therefore expose `needs.role` / `needs.group`
+    rather than a dict indexed by key.
+    """
+
+    role: tuple = None
+    group: tuple = None
+
+    @classmethod
+    def get(cls, role: list = None, group: list = None) -> "Needs":
+        """
+        Return the shared `Needs` instance for `role` and `group`, creating
+        it if no record currently holds one.
+        """
+        key = (_as_tuple(role), _as_tuple(group))
+        needs = _needs_cache.get(key)
+        if needs is None:
+            needs = _needs_cache[key] = cls(*key)
+        return needs
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Needs":
+        """
+        Return the shared `Needs` for a decoded json dict.
+        """
+        return cls.get(data.get("role"), data.get("group"))
+
+
+@dataclass(slots=True, eq=False)
 class UserRecord:
-    def __init__(
-        self,
-        name: str,
-        active: bool,
-        user: bool,
-        admin: bool,
-        settings: dict,
-        groups: list,
-        needs: Needs,
-        apikey: str = None,
-        permissions: list = None,
-    ):
-        self.name = name
-        self.active = active
-        self.user = user
-        self.admin = admin
-        self.settings = settings
-        self.groups = groups
-        self.needs = needs
-        self.apikey = apikey
-        self.permissions = permissions
+    """
+    A user account. A `needs` dict is stored as its shared `Needs`.
+    """
+
+    name: str
+    active: bool
+    user: bool
+    admin: bool
+    settings: dict
+    groups: list
+    needs: Needs
+    apikey: str = None
+    permissions: list = None
+
+    def __post_init__(self):
+        if isinstance(self.needs, dict):
+            self.needs = Needs.from_dict(self.needs)
 
 
+@dataclass(slots=True, eq=False)
 class PermissionRecord:
-    def __init__(
-        self,
-        key: str,
-        name: str,
-        dangerous: bool,
-        default_groups: list,
-        description: str,
-        needs: Needs,
-    ):
-        self.key = key
-        self.name = name
-        self.dangerous = dangerous
-        self.default_groups = default_groups
-        self.description = description
-        self.needs = needs
+    """
+    A permission. A `needs` dict is stored as its shared `Needs`.
+    """
+
+    key: str
+    name: str
+    dangerous: bool
+    default_groups: list
+    description: str
+    needs: Needs
+
+    def __post_init__(self):
+        if isinstance(self.needs, dict):
+            self.needs = Needs.from_dict(self.needs)
 
 
+@dataclass(slots=True, eq=False)
 class GroupRecord:
-    def __init__(
-        self,
-        key: str,
-        name: str,
-        description: str,
-        needs: Needs,
-        default: bool,
-        removable: bool,
-        changeable: bool,
-        toggleable: bool,
-        permissions: list = None,
-        subgroups: list = None,
-    ):
-        self.key = key
-        self.name = name
-        self.description = description
-        self.needs = needs
-        self.default = default
-        self.removable = removable
-        self.changeable = changeable
-        self.toggleable = toggleable
-        self.permissions = permissions
-        self.subgroups = subgroups
+    """
+    A user group. A `needs` dict is stored as its shared `Needs`.
+    """
+
+    key: str
+    name: str
+    description: str
+    needs: Needs
+    default: bool
+    removable: bool
+    changeable: bool
+    toggleable: bool
+    permissions: list = None
+    subgroups: list = None
+
+    def __post_init__(self):
+        if isinstance(self.needs, dict):
+            self.needs = Needs.from_dict(self.needs)
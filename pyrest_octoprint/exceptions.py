@@ -1,6 +1,5 @@
 from requests import Response
 from requests.exceptions import HTTPError
-from requests_toolbelt.utils import dump
 
 class HTTPException(Exception):
     """
@@ -25,6 +24,8 @@ class HTTPException(Exception):
         Return raw HTTP request and response data as
         str.
         """
+        from requests_toolbelt.utils import dump
+
         return dump.dump_response(self._response).decode('utf-8')
 
 
@@ -1,19 +1,105 @@
+from __future__ import annotations
+from collections import deque
 from datetime import datetime
-import os
+from functools import lru_cache
+from operator import itemgetter
+from typing import TYPE_CHECKING
 
 from . import datamodel
 from .base import BaseClient
 
+if TYPE_CHECKING:
+    from .client import Client
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_SELECT_PAYLOAD = {"command": "select", "print": False}
+_SELECT_AND_PRINT_PAYLOAD = {"command": "select", "print": True}
+_UNSELECT_PAYLOAD = {"command": "unselect"}
+_MOVE_COMMAND = "move"
+
+# Listing fields in the parameter order of `_init_file_information`,
+# `_init_file` and `_init_folder`, for passing them by position. Required
+# fields are read with an itemgetter, optional ones with `dict.get`.
+_get_information_fields = itemgetter("name", "display", "path", "type", "typePath")
+_FILE_OPTIONAL_FIELDS = (
+    "hash", "size", "date", "refs", "gcodeAnalysis", "prints", "statistics",
+)
+_FOLDER_OPTIONAL_FIELDS = ("size", "date", "origin", "prints", "refs")
+
+
+@lru_cache(maxsize=4096)
+def _timestamp_to_datetime(timestamp: int) -> datetime:
+    """
+    Convert an epoch timestamp to a local datetime. Listings tend to share
+    few distinct timestamps, so results are cached.
+    """
+    return datetime.fromtimestamp(timestamp)
+
+
+def _to_datetime(date: int) -> datetime:
+    return _timestamp_to_datetime(date) if date else None
+
+
+def _to_gcode_analysis(data: dict) -> datamodel.GcodeAnalysisInformation:
+    return datamodel.GcodeAnalysisInformation(**data) if data else None
+
+
+def _to_print_history(data: dict) -> datamodel.PrintHistory:
+    return datamodel.PrintHistory(**data) if data else None
+
+
+def _to_print_statistics(data: dict) -> datamodel.PrintStatistics:
+    return datamodel.PrintStatistics(**data) if data else None
+
+
+class _LazyField:
+    """
+    Descriptor for a listing field kept as its raw json value (stored under
+    `_<name>`) until first accessed, when it is converted with `convert` and
+    the result cached in its place. Values of any type other than `raw_types`
+    are treated as already converted.
+    """
+
+    def __init__(self, convert, raw_types: tuple):
+        self.convert = convert
+        self.raw_types = raw_types
+
+    def __set_name__(self, owner, name):
+        self.attr = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        value = getattr(obj, self.attr)
+        if value.__class__ in self.raw_types:
+            value = self.convert(value)
+            setattr(obj, self.attr, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.attr, value)
+
 
 class FileOrFolderDeleted(BaseException):
     pass
 
 
-class FileInformation(BaseClient):
+class FileInformation:
     """
     Base class defining shared members between `File` and `Folder` object.
+    Requests are made through `parent_client`, which every entry of a
+    listing shares, rather than through connection state of its own.
     """
 
+    __slots__ = (
+        "name", "display", "path", "type", "typePath", "user", "_deleted", "_api_path",
+        "_client",
+    )
+
     def __init__(
         self,
         name: str,
@@ -22,16 +108,10 @@ class FileInformation(BaseClient):
         type: str,
         typePath: list,
         user: str = None,
-        **kwargs,
+        *,
+        parent_client: BaseClient,
     ):
-        self.name = name
-        self.display = display
-        self.path = path
-        self.type = type
-        self.typePath = typePath
-        self.user = str(user) if user else None
-        self._deleted = False
-        super().__init__(**kwargs)
+        _init_file_information(self, name, display, path, type, typePath, user, parent_client)
 
 
 class Folder(FileInformation):
@@ -39,6 +119,11 @@ class Folder(FileInformation):
     Represents a folder within OctoPrint server storage.
     """
 
+    __slots__ = ("children", "size", "_date", "origin", "_prints", "resource", "download")
+
+    date = _LazyField(_to_datetime, (int, float))
+    prints = _LazyField(_to_print_history, (dict,))
+
     def __init__(
         self, 
         children: list = None, 
@@ -49,19 +134,8 @@ class Folder(FileInformation):
         refs: dict = None,
         **kwargs
     ):
-        self.children = []
-        for c in children:
-            if c.get("type", None) == "folder":
-                self.children.append(Folder(**c, parent_client=kwargs.get("parent_client", None)))
-            else:
-                self.children.append(File(**c, parent_client=kwargs.get("parent_client", None)))
-        self.size = size
-        self.date = datetime.fromtimestamp(date) if date else None
-        self.origin = str(origin) if origin else None
-        self.prints = datamodel.PrintHistory(**prints) if prints else None
-        if refs:
-            self.resource = refs.get("resource")
-            self.download = refs.get("download", None)
+        self.children = _build_tree(children or [], kwargs.get("parent_client", None))
+        _init_folder(self, size, date, origin, prints, refs)
         super().__init__(**kwargs)
 
     def __str__(self):
@@ -77,8 +151,7 @@ class Folder(FileInformation):
         params:
             path (str): path to file to delete
         """
-        path = os.path.join(self.origin, self.path)
-        resp = self._make_request("/api/files/" + path, "DELETE")
+        self._client._make_request_noresp(self._api_path, "DELETE")
         self._deleted = True
 
 
@@ -87,6 +160,16 @@ class File(FileInformation):
     Represents a File stored on the OctoPrint server.
     """
 
+    __slots__ = (
+        "origin", "hash", "size", "_date", "resource", "download",
+        "_gcodeAnalysis", "_prints", "_statistics",
+    )
+
+    date = _LazyField(_to_datetime, (int, float))
+    gcodeAnalysis = _LazyField(_to_gcode_analysis, (dict,))
+    prints = _LazyField(_to_print_history, (dict,))
+    statistics = _LazyField(_to_print_statistics, (dict,))
+
     def __init__(
         self,
         origin: str,
@@ -99,23 +182,7 @@ class File(FileInformation):
         statistics: dict = None,
         **kwargs,
     ):
-        self.origin = str(origin)
-        self.hash = str(hash) if hash else None
-        self.size = float(size) if size else None
-        self.date = datetime.fromtimestamp(date) if date else None
-        if refs:
-            self.resource = refs.get("resource")
-            self.download = refs.get("download", None)
-        else:
-            self.resource = None
-            self.download = None
-        self.gcodeAnalysis = (
-            datamodel.GcodeAnalysisInformation(**gcodeAnalysis)
-            if gcodeAnalysis
-            else None
-        )
-        self.prints = datamodel.PrintHistory(**prints) if prints else None
-        self.statistics = datamodel.PrintStatistics(**statistics) if statistics else None
+        _init_file(self, origin, hash, size, date, refs, gcodeAnalysis, prints, statistics)
         super().__init__(**kwargs)
 
     def __str__(self):
@@ -131,18 +198,10 @@ class File(FileInformation):
         params:
             print_now (bool): print file once selected
         """
-        if self._deleted:
-            raise FileOrFolderDeleted(
-                f"File(name='{self.name}') object is marked as deleted."
-            )
-        path = os.path.join(self.origin, self.path)
-        self._make_request(
-            "/api/files/" + path,
+        self._client._make_request_noresp(
+            self._api_path,
             "POST",
-            json={
-                "command": "select",
-                "print": print_now,
-            },
+            json=_SELECT_AND_PRINT_PAYLOAD if print_now else _SELECT_PAYLOAD,
         )
 
     def unselect(self):
@@ -152,13 +211,7 @@ class File(FileInformation):
         - endpoint: `/api/files/<path>`
         - method: `POST`
         """
-        self._make_request(
-            "/api/files/" + path,
-            "POST",
-            json={
-                "command": "unselect",
-            },
-        )
+        self._client._make_request_noresp(self._api_path, "POST", json=_UNSELECT_PAYLOAD)
 
     def delete(self):
         """
@@ -170,9 +223,9 @@ class File(FileInformation):
         params:
             path (str): path to file to delete
         """
-        path = os.path.join(self.origin, self.path)
-        resp = self._make_request("/api/files/" + path, "DELETE")
+        self._client._make_request_noresp(self._api_path, "DELETE")
         self._deleted = True
+        self.__class__ = _DeletedFile
 
     def move_into(self, folder: Folder):
         """
@@ -185,15 +238,165 @@ class File(FileInformation):
         params:
             folder (Folder): Folder to move self into.
         """
-        self._make_request(
-            "/api/files/" + path,
+        self._client._make_request_noresp(
+            self._api_path,
             "POST",
             json={
-                "command": "move",
+                "command": _MOVE_COMMAND,
                 "destination": folder.path,
             },
         )
-        self.path = os.path.join(folder.path, self.name)
+        self.path = f"{folder.path}/{self.name}"
+        self._api_path = f"/api/files/{self.origin}/{self.path}"
+
+    def refresh(self):
+        """
+        Re-read every field of `self` from the server, e.g. those a `File`
+        returned by `Client.upload_file` leaves as None.
+
+        - endpoint: `/api/files/<path>`
+        - method: `GET`
+        """
+        client = self._client
+        data = client._json(client._make_request(self._api_path))
+        get = data.get
+        _init_file(self, data["origin"], *map(get, _FILE_OPTIONAL_FIELDS))
+        _init_file_information(self, *_get_information_fields(data), get("user"), client)
+
+
+class _DeletedFile(File):
+    """
+    Class a `File` is switched to once deleted, so that its request methods
+    raise `FileOrFolderDeleted` without checking `_deleted` on every call.
+    """
+
+    __slots__ = ()
+
+    def _raise_deleted(self, *args, **kwargs):
+        raise FileOrFolderDeleted(
+            f"File(name='{self.name}') object is marked as deleted."
+        )
+
+    select = unselect = delete = move_into = refresh = _raise_deleted
+
+
+def _init_file_information(
+    obj: FileInformation,
+    name: str,
+    display: str,
+    path: str,
+    type: str,
+    typePath: list,
+    user: str,
+    parent_client: BaseClient,
+):
+    """
+    Assign the `FileInformation` members of `obj`, for both
+    `FileInformation.__init__` and the listing builders. `obj.origin` must
+    already be set.
+    """
+    obj.name = name
+    obj.display = display
+    obj.path = path
+    obj.type = type
+    obj.typePath = typePath
+    obj.user = str(user) if user else None
+    obj._deleted = False
+    obj._api_path = f"/api/files/{obj.origin}/{path}"
+    obj._client = parent_client
+
+
+def _init_file(
+    obj: File,
+    origin: str,
+    hash: str,
+    size: float,
+    date: int,
+    refs: dict,
+    gcodeAnalysis: dict,
+    prints: dict,
+    statistics: dict,
+):
+    """
+    Assign the members `File` adds to `FileInformation`, for both
+    `File.__init__` and `_build_file`. Lazy fields keep their raw values.
+    """
+    obj.origin = origin
+    obj.hash = hash
+    obj.size = size
+    obj._date = date
+    obj.resource = refs.get("resource") if refs else None
+    obj.download = refs.get("download", None) if refs else None
+    obj._gcodeAnalysis = gcodeAnalysis
+    obj._prints = prints
+    obj._statistics = statistics
+
+
+def _init_folder(obj: Folder, size: float, date: int, origin: str, prints: dict, refs: dict):
+    """
+    Assign the members `Folder` adds to `FileInformation`, other than its
+    `children`, for both `Folder.__init__` and `_build_folder`.
+    """
+    obj.size = size
+    obj._date = date
+    obj.origin = str(origin) if origin else None
+    obj._prints = prints
+    obj.resource = refs.get("resource") if refs else None
+    obj.download = refs.get("download", None) if refs else None
+
+
+def _build_file(data: dict, parent_client: BaseClient) -> File:
+    """
+    Build a `File` for a listing entry through `object.__new__`, skipping
+    the `File` -> `FileInformation` `__init__` chain but sharing its
+    `_init_file` / `_init_file_information` helpers. Fields are passed to
+    them by position; a missing optional field is None.
+    """
+    get = data.get
+    obj = object.__new__(File)
+    _init_file(obj, data["origin"], *map(get, _FILE_OPTIONAL_FIELDS))
+    _init_file_information(obj, *_get_information_fields(data), get("user"), parent_client)
+    return obj
+
+
+def _build_folder(data: dict, parent_client: BaseClient) -> Folder:
+    """
+    Build a `Folder` for a listing entry through `object.__new__`, see
+    `_build_file`. Its `children` are left empty for `_build_tree` to fill.
+    """
+    get = data.get
+    obj = object.__new__(Folder)
+    obj.children = []
+    _init_folder(obj, *map(get, _FOLDER_OPTIONAL_FIELDS))
+    _init_file_information(obj, *_get_information_fields(data), get("user"), parent_client)
+    return obj
+
+
+def _build_tree(entries: list, parent_client: BaseClient) -> list:
+    """
+    Build a `File` or `Folder` for every entry of a file listing, including
+    the `children` of folders at any depth. The tree is walked with a
+    worklist of `(target list, raw entries)` pairs rather than recursion.
+    """
+    if parent_client is None:
+        raise TypeError("Missing `parent_client` argument")
+    build_file, build_folder = _build_file, _build_folder
+    tree = []
+    worklist = deque([(tree, entries)])
+    pop, push = worklist.popleft, worklist.append
+    while worklist:
+        target, raw_entries = pop()
+        append = target.append
+        for x in raw_entries:
+            if x.get("type", None) == "folder":
+                folder = build_folder(x, parent_client)
+                children = x.get("children")
+                if children:
+                    push((folder.children, children))
+                append(folder)
+            else:
+                append(build_file(x, parent_client))
+    return tree
 
 
 class RetrieveResponse:
@@ -202,22 +405,61 @@ class RetrieveResponse:
     """
 
     def __init__(self, files=None, free: str = None, total: str = None, **kwargs):
-        if type(files) == dict:
-            self.files = [File(**files, **kwargs)] if files.get("type", None) != "folder" else [Folder(**files, **kwargs)]
-        elif type(files) == list:
-            self.files = []
-            for x in files:
-                if x.get("type", None) == "folder":
-                    self.files.append(Folder(**x, **kwargs))
-                else:
-                    self.files.append(File(**x, **kwargs))
-        elif files is not None:
-            raise TypeError(f"invalid type for files: {type(files)}")
-        else:
-            self.files = None
+        match files:
+            case dict():
+                self.files = _build_tree((files,), kwargs.get("parent_client", None))
+            case list():
+                self.files = _build_tree(files, kwargs.get("parent_client", None))
+            case None:
+                self.files = None
+            case _:
+                raise TypeError(f"invalid type for files: {type(files)}")
+        # a single folder, as returned for a path, is looked up by its children
+        entries = self.files
+        if type(files) is dict and entries and isinstance(entries[0], Folder):
+            entries = entries[0].children
+        self._by_name = {f.name: f for f in entries} if entries else {}
         self.free = str(free) if free else None
         self.total = str(total) if total else None
 
+    @classmethod
+    def from_dict(cls, data: dict, **kwargs) -> RetrieveResponse:
+        """
+        Build a RetrieveResponse from a decoded `/api/files` response. A
+        response for a single file or folder is wrapped as a one-item listing.
+        """
+        if "files" in data or "free" in data:
+            return cls(**data, **kwargs)
+        return cls(files=data, **kwargs)
+
+    @classmethod
+    def from_stream(cls, stream, parent_client: BaseClient) -> RetrieveResponse:
+        """
+        Build a RetrieveResponse from a file-like `stream` over a storage
+        root listing, parsing it incrementally with `ijson`. Each top-level
+        entry of `files` is built as soon as it has been read, so the decoded
+        listing is never held in memory whole.
+        """
+        listing = []
+        extend = listing.extend
+        scalars = {}
+        builder = None
+        for prefix, event, value in ijson.parse(stream, use_float=True):
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == "files.item" and event == "end_map":
+                    extend(_build_tree((builder.value,), parent_client))
+                    builder = None
+            elif prefix == "files.item" and event == "start_map":
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif prefix in ("free", "total"):
+                scalars[prefix] = value
+        response = cls(**scalars)
+        response.files = listing
+        response._by_name = {f.name: f for f in listing}
+        return response
+
     def __str__(self):
         return str("[" + ", ".join([str(x) for x in self.files]) + "]")
 
@@ -228,6 +470,8 @@ class AbridgedFileOrFolder:
     creating a file typically.
     """
 
+    __slots__ = ("name", "path", "origin", "resource", "download", "display")
+
     def __init__(
         self, name: str, path: str, origin: str, refs: dict = None, display: str = None
     ):
@@ -260,14 +504,52 @@ class UploadResponse(BaseClient):
         self.done = bool(done)
         if files:
             self.type = "file"
-            self.local_file = AbridgedFileOrFolder(**(files.get("local")))
+            local, sdcard = files.get("local"), files.get("sdcard")
+            self.local_file = AbridgedFileOrFolder(**local) if local is not None else None
             self.sdcard_file = (
-                AbridgedFileOrFolder(**(files.get("sdcard")))
-                if "sdcard" in files.keys()
-                else None
+                AbridgedFileOrFolder(**sdcard) if sdcard is not None else None
             )
         else:
             self.type = "folder"
             self.folder = AbridgedFileOrFolder(**folder)
         self.effectiveSelect = bool(effectiveSelect) if effectiveSelect else None
         self.effectivePrint = bool(effectivePrint) if effectivePrint else None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> UploadResponse:
+        """
+        Build an UploadResponse from a decoded upload / folder creation response.
+        """
+        return cls(**data)
+
+    def created(self, parent_client: Client, location: str = "local") -> FileInformation:
+        """
+        Return the `File` or `Folder` this response reports as created, built
+        from its abridged information without a request. The abridged
+        information only carries the `name`, `path`, `origin` and `refs` (and
+        possibly `display`) of the entry; the other fields of a file, such as
+        its `type`, `size`, `date` or `hash`, are None until `File.refresh`
+        is called.
+
+        params:
+            parent_client (Client): client the object makes requests with
+            location (str): storage the file was uploaded to, `local` or `sdcard`
+        """
+        if self.type == "file":
+            abridged = (self.sdcard_file if location == "sdcard" else None) or self.local_file
+            build, type, type_path = _build_file, None, None
+        else:
+            abridged = self.folder
+            build, type, type_path = _build_folder, "folder", ["folder"]
+        return build(
+            {
+                "name": abridged.name,
+                "display": abridged.display or abridged.name,
+                "path": abridged.path,
+                "origin": abridged.origin,
+                "refs": {"resource": abridged.resource, "download": abridged.download},
+                "type": type,
+                "typePath": type_path,
+            },
+            parent_client,
+        )
@@ -1,17 +1,22 @@
+from __future__ import annotations
+from dataclasses import dataclass, field, InitVar
+
 from . import datamodel
 from .files import FileInformation
 
 
+@dataclass(slots=True, eq=False)
 class JobInformation:
-    def __init__(
-        self, file: dict, lastPrintTime: float = None, averagePrintTime: float = None, estimatedPrintTime: float = None, filament: dict = None, user: str = None,
-    ):
+    file: InitVar[dict]
+    lastPrintTime: float = None
+    averagePrintTime: float = None
+    estimatedPrintTime: float = None
+    filament: dict = None
+    user: str = None
+    file_details: dict = field(init=False)
+
+    def __post_init__(self, file: dict):
         self.file_details = file
-        self.lastPrintTime = lastPrintTime
-        self.averagePrintTime = averagePrintTime
-        self.estimatedPrintTime = estimatedPrintTime
-        self.filament = filament
-        self.user = user
 
     def __str__(self):
         return str(self.to_dict())
@@ -27,12 +32,21 @@ class JobInformation:
 
 
 class JobInformationResponse:
+    __slots__ = ("job", "progress", "state", "error")
+
     def __init__(self, job: dict, progress: dict, state: str, error: str = None):
         self.job = JobInformation(**job)
         self.progress = datamodel.ProgressInformation(**progress)
         self.state = state
         self.error = error
 
+    @classmethod
+    def from_dict(cls, data: dict) -> JobInformationResponse:
+        """
+        Build a JobInformationResponse from a decoded `/api/job` response.
+        """
+        return cls(data["job"], data["progress"], data["state"], data.get("error", None))
+
     def __str__(self):
         return str(self.to_dict())
 
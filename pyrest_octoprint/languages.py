@@ -1,21 +1,17 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, eq=False)
 class ComponentList:
-    def __init__(self, identifier: str, display: str, languages: list = None):
-        self.identifier = identifier
-        self.display = display
-        self.languages = languages
+    identifier: str
+    display: str
+    languages: list = None
 
 
+@dataclass(slots=True, eq=False)
 class LanguagePackMetadata:
-    def __init__(
-        self,
-        locale: str,
-        locale_display: str,
-        locale_english: str,
-        last_update: int = None,
-        author: str = None,
-    ):
-        self.locale = locale
-        self.locale_display = locale_display
-        self.locale_english = locale_english
-        self.last_update = last_update
-        self.author = author
+    locale: str
+    locale_display: str
+    locale_english: str
+    last_update: int = None
+    author: str = None
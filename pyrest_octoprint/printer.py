@@ -1,13 +1,97 @@
+import asyncio
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+
 from .datamodel import *
-from .base import BaseClient
+from .base import BaseClient, _JSON_HEADERS, _json_body
 from . import files, printerprofiles, job
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_SD_INIT_BODY = _json_body({"command": "init"})
+_SD_REFRESH_BODY = _json_body({"command": "refresh"})
+_SD_RELEASE_BODY = _json_body({"command": "release"})
+_START_BODY = _json_body({"command": "start"})
+_CANCEL_BODY = _json_body({"command": "cancel"})
+_RESTART_BODY = _json_body({"command": "restart"})
+_PAUSE_BODY = _json_body({"command": "pause", "action": "pause"})
+_RESUME_BODY = _json_body({"command": "pause", "action": "resume"})
+_TOGGLE_BODY = _json_body({"command": "pause", "action": "toggle"})
+
+_TOOL_KEYS = tuple(f"tool{i}" for i in range(32))
+_INT_OR_LIST = (int, list)
+_LIST_OR_TUPLE = (list, tuple)
+
+# G-code queued by the `Printer.batch()` blocks open in the current context,
+# keyed by printer, so other threads and tasks are never drawn into a batch.
+# None outside any batch; each `batch()` sets a dict of its own.
+_batch_queues = ContextVar("batch_queues", default=None)
+
+
+def _tool_dict(values: list) -> dict:
+    """
+    Map each value in `values` to the `tool{N}` key of its index N. Keys
+    are taken from `_TOOL_KEYS`, and only formatted beyond its length.
+    """
+    if len(values) <= len(_TOOL_KEYS):
+        return dict(zip(_TOOL_KEYS, values))
+    return {
+        (_TOOL_KEYS[i] if i < len(_TOOL_KEYS) else f"tool{i}"): v
+        for i, v in enumerate(values)
+    }
+
+
+def _load_printer_state(stream) -> tuple:
+    """
+    Parse a `/api/printer` response from the file-like `stream` incrementally
+    with `ijson`. Returns the response without its temperature history, and
+    the list of history records, each built as soon as it has been read.
+    """
+    root = ijson.ObjectBuilder()
+    history = []
+    record = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if record is not None:
+            record.event(event, value)
+            if prefix == "temperature.history.item" and event == "end_map":
+                history.append(record.value)
+                record = None
+        elif prefix == "temperature.history.item" and event == "start_map":
+            record = ijson.ObjectBuilder()
+            record.event(event, value)
+        elif prefix == "temperature.history" or (
+            prefix == "temperature" and event == "map_key" and value == "history"
+        ):
+            continue
+        else:
+            root.event(event, value)
+    return root.value, history
+
+
+def _as_str(value) -> str:
+    """
+    Return `value` as a str without copying it if it already is one. None
+    is kept as None.
+    """
+    if value is None or type(value) is str:
+        return value
+    return str(value)
+
 
 class ErrorInformation:
     """
     Defines error information received from Printer.
     """
 
+    __slots__ = ("error", "reason", "consequence", "faq", "logs")
+
     def __init__(
         self,
         error: str = None,
@@ -16,69 +100,182 @@ class ErrorInformation:
         faq: str = None,
         logs: list = None,
     ):
-        self.error = str(error)
-        self.reason = str(reason)
-        self.consequence = str(consequence)
-        self.faq = str(faq)
-        if logs is not None:
-            self.logs = list(logs)
+        self.error = _as_str(error)
+        self.reason = _as_str(reason)
+        self.consequence = _as_str(consequence)
+        self.faq = _as_str(faq)
+        self.logs = logs if logs is None or type(logs) is list else list(logs)
 
 
 class TemperatureState:
     """
     Defines temperature state of Printer for tools and bed. For
     chamber temperature information, see `ChamberState`.
+
+    Treated as immutable once built: `to_dict` is computed once and cached,
+    and returns the same dict on every call, which must not be modified.
     """
 
+    __slots__ = ("tools", "bed", "_cached_dict")
+
     def __init__(self, tools: list = None, bed: TemperatureData = None):
         self.tools = tools
         self.bed = bed
+        self._cached_dict = None
 
     def __str__(self):
         return str(self.to_dict())
 
     def to_dict(self):
-        return {"tools": [x.to_dict() for x in self.tools if x is not None], "bed": self.bed.to_dict() if self.bed is not None else None}
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "tools": [x.to_dict() for x in self.tools if x is not None],
+                "bed": self.bed.to_dict() if self.bed is not None else None,
+            }
+        return self._cached_dict
+
+
+class TemperatureHistory(Sequence):
+    """
+    Read-only sequence of the temperature records of a history retrieved
+    from OctoPrint, ordered by time. Records are kept as received and only
+    parsed with `parse` when accessed. `at` and `find` look records up by
+    timestamp.
+    """
+
+    def __init__(self, records: list, parse: callable):
+        records = sorted(records, key=lambda x: x["time"])
+        self._records = records
+        self._times = [x["time"] for x in records]
+        self._parsed = [None] * len(records)
+        self._parse = parse
+
+    def _get(self, i: int):
+        value = self._parsed[i]
+        if value is None:
+            value = self._parsed[i] = self._parse(self._records[i])
+        return value
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._get(j) for j in range(*i.indices(len(self._records)))]
+        if i < 0:
+            i += len(self._records)
+        if not 0 <= i < len(self._records):
+            raise IndexError("temperature history index out of range")
+        return self._get(i)
+
+    def __iter__(self):
+        return map(self._get, range(len(self._records)))
+
+    def __len__(self):
+        return len(self._records)
+
+    @property
+    def times(self) -> tuple:
+        """
+        Timestamps of the records, in order.
+        """
+        return tuple(self._times)
+
+    def find(self, time: int):
+        """
+        Return the record taken at `time`, or None if there is none.
+        """
+        i = bisect_left(self._times, time)
+        if i == len(self._times) or self._times[i] != time:
+            return None
+        return self._get(i)
+
+    def at(self, time: int):
+        """
+        Return the latest record at or before `time`, or None if the history
+        starts after it.
+        """
+        i = bisect_right(self._times, time)
+        return self._get(i - 1) if i else None
+
+    def by_time(self) -> Mapping:
+        """
+        Return a read-only mapping of timestamp to record over this history.
+        """
+        return TemperatureHistoryByTime(self)
+
+
+class TemperatureHistoryByTime(Mapping):
+    """
+    Read-only mapping of timestamp to record over a `TemperatureHistory`,
+    the `{time: record}` form `Printer.temp_history` and
+    `Printer.chamber_history` are kept in. Records are parsed on access.
+    """
+
+    def __init__(self, history: TemperatureHistory):
+        self.history = history
+
+    def __getitem__(self, time: int):
+        value = self.history.find(time)
+        if value is None:
+            raise KeyError(time)
+        return value
+
+    def __iter__(self):
+        return iter(self.history._times)
+
+    def __len__(self):
+        return len(self.history)
 
 
 class FullState:
     """
     Defines a FullStateResponse retrieved from OctoPrint.
+
+    Treated as immutable once built: `to_dict` is computed once and cached,
+    and returns the same dict on every call, which must not be modified.
     """
 
+    __slots__ = (
+        "temperature",
+        "sd_ready",
+        "state_text",
+        "state_flags",
+        "temperature_history",
+        "_cached_dict",
+    )
+
     def __init__(
         self,
         temperature: TemperatureState,
         sd_ready: bool,
         state_text: str,
         state_flags: dict,
-        temperature_history: list = None,
+        temperature_history: Sequence = None,
     ):
         self.temperature = temperature
         self.sd_ready = bool(sd_ready)
-        self.state_text = str(state_text)
-        self.state_flags = dict(state_flags)
-        self.temperature_history = (
-            list(temperature_history) if temperature_history else []
-        )
+        self.state_text = state_text if type(state_text) is str else str(state_text)
+        self.state_flags = state_flags if type(state_flags) is dict else dict(state_flags)
+        self.temperature_history = temperature_history if temperature_history else []
+        self._cached_dict = None
 
     def __str__(self):
+        history = self.temperature_history
         return str({
-            "temperature": self.temperature.to_dict(),
-            "sd.ready": self.sd_ready,
-            "state.text": self.state_text,
-            "state.flags": self.state_flags,
-            "temperature.history": "[" + ", ".join([str(x) for x in self.temperature_history]) + "]" if self.temperature_history else None,
+            **self.to_dict(),
+            "temperature.history": (
+                "[" + ", ".join([str(x) for x in history]) + "]" if history else None
+            ),
         })
 
     def to_dict(self):
-        return {
-            "temperature": self.temperature.to_dict(),
-            "sd.ready": self.sd_ready,
-            "state.text": self.state_text,
-            "state.flags": self.state_flags,
-            "temperature.history": [x.to_dict() for x in self.temperature_history],
-        }
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "temperature": self.temperature.to_dict(),
+                "sd.ready": self.sd_ready,
+                "state.text": self.state_text,
+                "state.flags": self.state_flags,
+                "temperature.history": [x.to_dict() for x in self.temperature_history],
+            }
+        return self._cached_dict
 
 
 class ChamberState:
@@ -86,7 +283,9 @@ class ChamberState:
     Defines Chamber temperature data retrieved from OctoPrint.
     """
 
-    def __init__(self, temperature: TemperatureState, temperature_history: list = None):
+    __slots__ = ("temperature", "temperature_history")
+
+    def __init__(self, temperature: TemperatureState, temperature_history: Mapping = None):
         self.temperature = temperature
         self.temperature_history = temperature_history
 
@@ -99,25 +298,82 @@ class Printer(BaseClient):
     """
     Represents a printer within Octoprint and its appropriate
     operations for interaction with its components.
+
+    Every request method has a coroutine counterpart suffixed `_async`,
+    e.g. `await printer.tool_target_async(200)`.
     """
 
+    # seconds for which a connection state confirming the printer is
+    # connected is reused by `_ensure_connection`; 0 always re-checks.
+    connection_ttl = 0.5
+    # seconds for which the custom controls returned by `printer_controls`
+    # are reused; they only change when config.yaml is edited. 0 disables.
+    controls_ttl = 300.0
+
     def __init__(self, serial_port: str, **kwargs):
         self.serial_port = str(serial_port)
         self.baudrate = None
         self.printer_profile = None
+        self._conn_cache = None
+        self._controls_cache = None
+        self._reconnect_lock = threading.Lock()
+        # number of reconnects made by `_ensure_connection`, and the result
+        # of the last one, handed to callers that waited on it
+        self._reconnects = 0
+        self._reconnect_result = None
         super().__init__(**kwargs)
 
+    @contextmanager
+    def batch(self):
+        """
+        Queue the G-code equivalent of `printhead_jog`, `printhead_home`,
+        `printhead_feedrate`, `tool_target`, `tool_flowrate`, `bed_target`
+        and `chamber_target` calls made within the block, and send them all
+        with a single `printer_command` once it exits without error. Other
+        methods are sent immediately. Nested blocks join the outermost one.
+
+        The batch only collects calls made from the same thread or asyncio
+        task, including `*_async` calls awaited within it; calls from
+        elsewhere are sent immediately.
+
+            with printer.batch():
+                printer.tool_target(210)
+                printer.bed_target(60)
+        """
+        queues = _batch_queues.get()
+        if queues is not None and self in queues:
+            yield self
+            return
+        pending = []
+        token = _batch_queues.set({**(queues or {}), self: pending})
+        try:
+            yield self
+        finally:
+            _batch_queues.reset(token)
+        if pending:
+            self.printer_command(commands=pending)
+
+    def _queue(self, *commands: str) -> bool:
+        """
+        Queue G-code `commands` when within `batch()`. Returns whether they
+        were queued, else the caller should send its request itself.
+        """
+        queues = _batch_queues.get()
+        pending = queues.get(self) if queues is not None else None
+        if pending is None:
+            return False
+        pending.extend(commands)
+        return True
+
     def _parse_temperature(self, data: dict) -> TemperatureState:
         """
         Parse a json response containing a TemperatureState object
         into a python object.
         """
-        tools = []
-        for k in [
-            x for x in sorted(data.keys(), key=lambda x: x) if x.startswith("tool")
-        ]:
-            tools.append(TemperatureData(**data[k]))
-        bed = TemperatureData(**(data["bed"])) if "bed" in data.keys() else None
+        tool_items = [(int(k[4:]), v) for k, v in data.items() if k.startswith("tool")]
+        tool_items.sort()
+        tools = [TemperatureData(**v) for _, v in tool_items]
+        bed = TemperatureData(**(data["bed"])) if "bed" in data else None
         return TemperatureState(tools=tools, bed=bed)
 
     def connect(
@@ -158,6 +414,7 @@ class Printer(BaseClient):
         if autoconnect:
             data["autoconnect"] = autoconnect
         resp = self._make_request("/api/connection", "POST", json=data)
+        self._conn_cache = None
         return self._ensure_connection(fail_on_disconnect=True)
 
     def disconnect(self):
@@ -169,6 +426,7 @@ class Printer(BaseClient):
         except PrinterConnectionError:
             return
         data = {"command": "disconnect"}
+        self._conn_cache = None
         resp = self._make_request("/api/connection", "POST", json=data)
 
     def _ensure_connection(
@@ -179,8 +437,19 @@ class Printer(BaseClient):
     ) -> dict:
         """
         Retrieve current connection in OctoPrint, if not connected to matching
-        serial port then reconnect.
-        """
+        serial port then reconnect. A state confirming the connection is
+        reused for `connection_ttl` seconds.
+
+        Reconnects are single-flight: concurrent callers finding the printer
+        disconnected wait for the first one's reconnect and share its result,
+        whatever `connection_ttl` is. A caller only reconnects itself if no
+        reconnect has completed since it checked the connection.
+        """
+        now = time.monotonic()
+        cache = self._conn_cache
+        if cache is not None and now < cache[0]:
+            return cache[1]
+        reconnects = self._reconnects
         connection_data = self._connection_settings()
         if (
             connection_data.get("current", {}).get("state", None) in [None, "Error", "CloseOrError"]
@@ -199,7 +468,14 @@ class Printer(BaseClient):
                 printer_profile = (
                     self.printer_profile if printer_profile is None else printer_profile
                 )
-                connection_data = self.connect(baudrate, printer_profile)
+                with self._reconnect_lock:
+                    if self._reconnects != reconnects:
+                        return self._reconnect_result
+                    connection_data = self.connect(baudrate, printer_profile)
+                    self._reconnect_result = connection_data
+                    self._reconnects += 1
+        else:
+            self._conn_cache = (now + self.connection_ttl, connection_data)
         return connection_data
 
     def retrieve_info(self, history: int = 0) -> FullState:
@@ -211,6 +487,9 @@ class Printer(BaseClient):
         - endpoint: `/api/printer`
         - method: `GET`
 
+        With `ijson` installed, a response including history is parsed
+        incrementally while it is downloaded.
+
         params:
             history (int): number of temperature records to include
 
@@ -225,17 +504,18 @@ class Printer(BaseClient):
             data["limit"] = history
 
         self._ensure_connection()
-        resp = self._make_request("/api/printer", params=data)
-
-        resp_data = resp.json()
-        temp_history = resp_data["temperature"].pop("history", [])
+        if history > 0 and ijson is not None:
+            with self._make_request("/api/printer", params=data, stream=True) as resp:
+                resp.raw.decode_content = True
+                resp_data, temp_history = _load_printer_state(resp.raw)
+        else:
+            resp = self._make_request("/api/printer", params=data)
+            resp_data = self._json(resp)
+            temp_history = resp_data["temperature"].pop("history", [])
 
         self.temperature = self._parse_temperature(resp_data["temperature"])
-        self.temp_history = {}
-        for x in temp_history:
-            k = x.pop("time")
-            v = self._parse_temperature(x)
-            self.temp_history[k] = v
+        history = TemperatureHistory(temp_history, self._parse_temperature)
+        self.temp_history = history.by_time()
         self.sd_ready = resp_data.get("sd", {}).get("ready", None)
         self.state = str(resp_data["state"]["text"])
         for k, v in resp_data["state"]["flags"].items():
@@ -245,7 +525,7 @@ class Printer(BaseClient):
             self.sd_ready,
             self.state,
             resp_data["state"]["flags"],
-            self.temp_history,
+            history,
         )
 
     def printhead_jog(
@@ -284,16 +564,18 @@ class Printer(BaseClient):
             raise TypeError("no `x`, `y`, or `z` argument was provided")
 
         data = {"command": "jog"}
-        if x:
-            data["x"] = x
-        if y:
-            data["y"] = y
-        if z:
-            data["z"] = z
+        data.update((axis, v) for axis, v in zip("xyz", (x, y, z)) if v)
         if absolute:
             data["absolute"] = absolute
         if speed:
             data["speed"] = speed
+        move = "G1" + "".join(
+            f" {axis.upper()}{data[axis]}" for axis in ("x", "y", "z") if axis in data
+        )
+        if speed:
+            move += f" F{speed}"
+        if self._queue(*(("G90", move) if absolute else ("G91", move, "G90"))):
+            return
         self._ensure_connection()
         resp = self._make_request("/api/printer/printhead", "POST", json=data)
 
@@ -309,17 +591,13 @@ class Printer(BaseClient):
             y (bool): home the printer along the y-axis
             z (bool): home the printer along the z-axis
         """
-        if True not in [x, y, z]:
+        if not (x or y or z):
             raise TypeError("one of `x`, `y`, or `z` must be `True`")
 
+        data = {"command": "home", "axes": [a for a, f in zip("xyz", (x, y, z)) if f]}
+        if self._queue("G28 " + " ".join(a.upper() for a in data["axes"])):
+            return
         self._ensure_connection()
-        data = {"command": "home", "axes": []}
-        if x:
-            data["axes"].append("x")
-        if y:
-            data["axes"].append("y")
-        if z:
-            data["axes"].append("z")
         resp = self._make_request("/api/printer/printhead", "POST", json=data)
 
     def printhead_feedrate(self, factor: float = 100.0):
@@ -337,6 +615,8 @@ class Printer(BaseClient):
             factor /= round(100.0, 2)
         if factor > 2.0 or factor < 0.5:
             raise ValueError("`factor` must be between [0.5, 2.0] or [50, 200].")
+        if self._queue(f"M220 S{round(factor * 100)}"):
+            return
 
         self._ensure_connection()
         resp = self._make_request(
@@ -360,15 +640,16 @@ class Printer(BaseClient):
         params:
             temp (int / list): temperature(s) for tool(s) in celsius.
         """
-        if type(temp) not in [int, list]:
+        if not isinstance(temp, _INT_OR_LIST) or isinstance(temp, bool):
             raise ValueError("`temp` must be either an integer or list object")
-        elif type(temp) == int:
+        elif isinstance(temp, int):
             data = {"command": "target", "targets": {"tool": temp}}
+            gcode = (f"M104 S{temp}",)
         else:
-            targets = {}
-            for i, x in enumerate(temp):
-                targets[f"tool{i}"] = x
-            data = {"command": "target", "targets": targets}
+            data = {"command": "target", "targets": _tool_dict(temp)}
+            gcode = tuple(f"M104 T{i} S{x}" for i, x in enumerate(temp))
+        if self._queue(*gcode):
+            return
 
         self._ensure_connection()
         resp = self._make_request("/api/printer/tool", "POST", json=data)
@@ -384,10 +665,7 @@ class Printer(BaseClient):
             offsets (list): list of temperature offsets, with index N being
                 offset for tool N.
         """
-        _offsets = {}
-        for i, x in enumerate(offsets):
-            _offsets[f"tool{i}"] = x
-        data = {"command": "offset", "offsets": _offsets}
+        data = {"command": "offset", "offsets": _tool_dict(offsets)}
 
         self._ensure_connection()
         resp = self._make_request("/api/printer/tool", "POST", json=data)
@@ -450,6 +728,8 @@ class Printer(BaseClient):
             factor /= round(100.0, 2)
         if factor > 1.25 or factor < 0.75:
             raise ValueError("`factor` must be between [0.75, 1.25] or [75, 125].")
+        if self._queue(f"M221 S{round(factor * 100)}"):
+            return
 
         self._ensure_connection()
         resp = self._make_request(
@@ -475,9 +755,11 @@ class Printer(BaseClient):
         if target < 0:
             raise ValueError("`target` must be zero or positive")
         data = {"command": "target", "target": target}
+        if self._queue(f"M140 S{target}"):
+            return
 
         self._ensure_connection()
-        resp = self._make_request("/api/printer/bed", json=data)
+        resp = self._make_request("/api/printer/bed", "POST", json=data)
 
     def bed_offset(self, offset: int):
         """
@@ -492,7 +774,7 @@ class Printer(BaseClient):
         data = {"command": "offset", "offset": offset}
 
         self._ensure_connection()
-        resp = self._make_request("/api/printer/bed", json=data)
+        resp = self._make_request("/api/printer/bed", "POST", json=data)
 
     def chamber_target(self, target: int):
         """
@@ -508,9 +790,11 @@ class Printer(BaseClient):
         if target < 0:
             raise ValueError("`target` must be zero or positive")
         data = {"command": "target", "target": target}
+        if self._queue(f"M141 S{target}"):
+            return
 
         self._ensure_connection()
-        resp = self._make_request("/api/printer/chamber", json=data)
+        resp = self._make_request("/api/printer/chamber", "POST", json=data)
 
     def chamber_offset(self, offset: int):
         """
@@ -525,7 +809,7 @@ class Printer(BaseClient):
         data = {"command": "offset", "offset": offset}
 
         self._ensure_connection()
-        resp = self._make_request("/api/printer/chamber", json=data)
+        resp = self._make_request("/api/printer/chamber", "POST", json=data)
 
     def retrieve_chamber(self, history: int = 0):
         """
@@ -549,15 +833,13 @@ class Printer(BaseClient):
         self._ensure_connection()
         resp = self._make_request("/api/printer/chamber", params=data)
 
-        resp_data = resp.json()
-        temp_history = resp_data.pop("history", None)
+        resp_data = self._json(resp)
+        temp_history = resp_data.pop("history", None) or []
 
         self.chamber = TemperatureData(**(resp_data["chamber"]))
-        self.chamber_history = {}
-        for x in temp_history:
-            k = x.pop("time")
-            v = TemperatureData(**(x["chamber"]))
-            self.temp_history[k] = v
+        self.chamber_history = TemperatureHistory(
+            temp_history, lambda x: TemperatureData(**(x["chamber"]))
+        ).by_time()
         return ChamberState(self.chamber, self.chamber_history)
 
     def sd_init(self):
@@ -571,7 +853,9 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request("/api/printer/sd", "POST", json={"command": "init"})
+        self._make_request_noresp(
+            "/api/printer/sd", "POST", data=_SD_INIT_BODY, headers=_JSON_HEADERS
+        )
 
     def sd_refresh(self):
         """
@@ -582,8 +866,8 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request(
-            "/api/printer/sd", "POST", json={"command": "refresh"}
+        self._make_request_noresp(
+            "/api/printer/sd", "POST", data=_SD_REFRESH_BODY, headers=_JSON_HEADERS
         )
 
     def sd_release(self):
@@ -597,8 +881,8 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request(
-            "/api/printer/sd", "POST", json={"command": "release"}
+        self._make_request_noresp(
+            "/api/printer/sd", "POST", data=_SD_RELEASE_BODY, headers=_JSON_HEADERS
         )
 
     def is_sd_ready(self):
@@ -610,7 +894,7 @@ class Printer(BaseClient):
         """
         self._ensure_connection()
         resp = self._make_request("/api/printer/sd")
-        self.sd_ready = resp.json().get("ready", None)
+        self.sd_ready = self._json(resp).get("ready", None)
         return self.sd_ready
 
     def printer_error(self):
@@ -622,7 +906,7 @@ class Printer(BaseClient):
         """
         self._ensure_connection()
         resp = self._make_request("/api/printer/error")
-        return ErrorInformation(**(resp.json()))
+        return ErrorInformation(**(self._json(resp)))
 
     def printer_command(
         self,
@@ -655,11 +939,13 @@ class Printer(BaseClient):
             )
         if context and not script:
             raise TypeError("`context` should only be provided when providing `script`")
+        if commands and not isinstance(commands, _LIST_OR_TUPLE):
+            raise TypeError("`commands` must be a list or tuple of commands")
         commands = [str(c) for c in commands] if commands else None
 
         data = {}
         if command:
-            data["command"]
+            data["command"] = str(command)
         elif commands:
             data["commands"] = commands
         elif script:
@@ -675,16 +961,26 @@ class Printer(BaseClient):
         self._ensure_connection()
         resp = self._make_request("/api/printer/command", "POST", json=data)
 
-    def printer_controls(self):
+    def printer_controls(self, refresh: bool = False):
         """
-        Retrieves the custom controls as configured in config.yaml.
+        Retrieves the custom controls as configured in config.yaml. The
+        result is reused for `controls_ttl` seconds.
 
         - endpoint: `/api/printer/command/custom`
         - method: `GET`
+
+        params:
+            refresh (bool): bypass the cached controls and fetch them again
         """
+        now = time.monotonic()
+        cache = self._controls_cache
+        if not refresh and cache is not None and now < cache[0]:
+            return cache[1]
         self._ensure_connection()
         resp = self._make_request("/api/printer/command/custom")
-        return resp.json()
+        controls = self._json(resp)
+        self._controls_cache = (now + self.controls_ttl, controls)
+        return controls
 
     def job_info(self) -> job.JobInformationResponse:
         """
@@ -696,16 +992,13 @@ class Printer(BaseClient):
         """
         self._ensure_connection()
         resp = self._make_request("/api/job")
-        resp_data = resp.json()
+        resp_data = self._json(resp)
 
-        self.job = resp_data.get("job")
-        self.progress = resp_data.get("progress")
-        self.print_status = resp_data.get("state")
-        self.print_error = resp_data.get("error", None)
-        obj = job.JobInformationResponse(
-            self.job, self.progress, self.print_status, self.print_error
-        )
+        obj = job.JobInformationResponse.from_dict(resp_data)
         self.job = obj.job
+        self.progress = resp_data.get("progress")
+        self.print_status = obj.state
+        self.print_error = obj.error
         return obj
 
     def start_print(self, file: files.File):
@@ -720,7 +1013,7 @@ class Printer(BaseClient):
         """
         self._ensure_connection()
         file.select()
-        self._make_request("/api/job", "POST", json={"command": "start"})
+        self._make_request_noresp("/api/job", "POST", data=_START_BODY, headers=_JSON_HEADERS)
 
     def cancel_print(self):
         """
@@ -731,7 +1024,7 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request("/api/job", "POST", json={"command": "cancel"})
+        self._make_request_noresp("/api/job", "POST", data=_CANCEL_BODY, headers=_JSON_HEADERS)
 
     def restart_print(self):
         """
@@ -744,7 +1037,7 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request("/api/job", "POST", json={"command": "restart"})
+        self._make_request_noresp("/api/job", "POST", data=_RESTART_BODY, headers=_JSON_HEADERS)
 
     def pause_print(self):
         """
@@ -755,9 +1048,7 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request(
-            "/api/job", "POST", json={"command": "pause", "action": "pause"}
-        )
+        self._make_request_noresp("/api/job", "POST", data=_PAUSE_BODY, headers=_JSON_HEADERS)
 
     def resume_print(self):
         """
@@ -768,9 +1059,7 @@ class Printer(BaseClient):
         - method: `POST`
         """
         self._ensure_connection()
-        resp = self._make_request(
-            "/api/job", "POST", json={"command": "pause", "action": "resume"}
-        )
+        self._make_request_noresp("/api/job", "POST", data=_RESUME_BODY, headers=_JSON_HEADERS)
 
     def toggle_print(self):
         """
@@ -780,6 +1069,75 @@ class Printer(BaseClient):
         - endpoint: `/api/job`
         - method: `POST`
         """
-        resp = self._make_request(
-            "/api/job", "POST", json={"command": "pause", "action": "toggle"}
-        )
+        self._make_request_noresp("/api/job", "POST", data=_TOGGLE_BODY, headers=_JSON_HEADERS)
+
+
+def _async_variant(method: callable) -> callable:
+    """
+    Wrap a blocking `Printer` method as a coroutine function that runs it in
+    a worker thread, so several commands can be awaited concurrently (e.g.
+    with `asyncio.gather`) over the client's connection pool.
+    """
+
+    async def method_async(self, *args, **kwargs):
+        return await asyncio.to_thread(method, self, *args, **kwargs)
+
+    method_async.__name__ = f"{method.__name__}_async"
+    method_async.__qualname__ = f"Printer.{method.__name__}_async"
+    method_async.__doc__ = (
+        f"Asynchronous variant of `Printer.{method.__name__}`, run in a worker thread."
+    )
+    return method_async
+
+
+for _name in (
+    "connect",
+    "disconnect",
+    "retrieve_info",
+    "printhead_jog",
+    "printhead_home",
+    "printhead_feedrate",
+    "tool_target",
+    "tool_offsets",
+    "tool_select",
+    "tool_extrude",
+    "tool_flowrate",
+    "bed_target",
+    "bed_offset",
+    "chamber_target",
+    "chamber_offset",
+    "retrieve_chamber",
+    "sd_init",
+    "sd_refresh",
+    "sd_release",
+    "is_sd_ready",
+    "printer_error",
+    "printer_command",
+    "printer_controls",
+    "job_info",
+    "start_print",
+    "cancel_print",
+    "restart_print",
+    "pause_print",
+    "resume_print",
+    "toggle_print",
+):
+    setattr(Printer, f"{_name}_async", _async_variant(getattr(Printer, _name)))
+del _name
+
+
+async def fleet_retrieve_info(printers, **kwargs) -> list:
+    """
+    Retrieve the state of several printers concurrently.
+
+    Each printer's connection check and state request run in their own
+    worker thread, so a print farm is polled in roughly the time of its
+    slowest printer instead of the sum of all of them.
+
+    params:
+        printers (list): `Printer` objects to retrieve the state of
+        kwargs: passed on to `Printer.retrieve_info`, e.g. `history`
+
+    Returns the `FullState` of each printer, in the order given.
+    """
+    return list(await asyncio.gather(*(p.retrieve_info_async(**kwargs) for p in printers)))
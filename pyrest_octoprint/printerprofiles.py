@@ -1,6 +1,17 @@
+import copy
+from dataclasses import dataclass
+
 from .base import BaseClient
 
+
 class Profile(BaseClient):
+    """
+    Represents a printer profile within OctoPrint. The profile data last
+    retrieved or sent is kept, so that `update` only sends the fields that
+    differ from it, including in-place edits of `volume`, `axes` and
+    `extruder`.
+    """
+
     def __init__(
         self,
         id: str = None,
@@ -30,6 +41,7 @@ class Profile(BaseClient):
         self.axes = dict(axes) if axes else None
         self.extruder = dict(extruder) if extruder else None
         self._deleted = False
+        self._synced = copy.deepcopy(self.to_dict())
         super().__init__(**kwargs)
 
     def __str__(self) -> str:
@@ -67,16 +79,23 @@ class Profile(BaseClient):
 
     def update(self):
         """
-        Update any changes made to the Profile object within OctoPrint.
+        Update any changes made to the Profile object within OctoPrint. Only
+        the members that differ from the profile as last retrieved or updated
+        are sent, nested dicts as a whole; nothing is sent if there are none.
 
         - endpoint: `/api/printerprofiles/<self.id>`
         - method: `PATCH`
         """
+        synced = self._synced
+        changes = {k: v for k, v in self.to_dict().items() if synced.get(k) != v}
+        if not changes:
+            return
         resp = self._make_request(
-            f"/api/printerprofiles/{self.id}", "PATCH", json={"profile": self.to_dict()}
+            f"/api/printerprofiles/{self.id}", "PATCH", json={"profile": changes}
         )
-        for k, v in resp.json().get("profile").items():
+        for k, v in self._json(resp).get("profile").items():
             setattr(self, k, v)
+        self._synced = copy.deepcopy(self.to_dict())
 
     def delete(self):
         """
@@ -89,7 +108,7 @@ class Profile(BaseClient):
         self._deleted = True
 
 
+@dataclass(slots=True, eq=False)
 class AddOrUpdateRequest:
-    def __init__(self, profiles: Profile, basedOn: str = None):
-        self.profiles = profiles
-        self.basedOn = basedOn
+    profiles: Profile
+    basedOn: str = None
@@ -3,6 +3,10 @@ class CommandDefinition:
     Defines a definition of a system command in OctoPrint.
     """
 
+    __slots__ = (
+        "name", "command", "action", "source", "resource", "confirm", "is_async", "ignore",
+    )
+
     def __init__(
         self,
         name: str,
@@ -22,5 +26,5 @@ class CommandDefinition:
         self.confirm = str(confirm) if confirm else None
         self.is_async = kwargs.pop("async", None)
         self.ignore = bool(ignore) if ignore is not None else None
-        if len(kwargs.keys()) > 0:
-            raise TypeError("unrecognized arguments: '{}'".format(list(kwargs.keys())))
+        if kwargs:
+            raise TypeError("unrecognized arguments: '{}'".format(list(kwargs)))
@@ -1,48 +1,35 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, eq=False)
 class RenderedTimelapse:
-    def __init__(
-        self, name: str, size: str, bytes: int, date: str, url: str, thumbnail: str
-    ):
-        self.name = name
-        self.size = size
-        self.bytes = bytes
-        self.date = date
-        self.url = url
-        self.thumbnail = thumbnail
+    name: str
+    size: str
+    bytes: int
+    date: str
+    url: str
+    thumbnail: str
 
 
+@dataclass(slots=True, eq=False)
 class UnrenderedTimelapse:
-    def __init__(
-        self,
-        name: str,
-        size: str,
-        bytes: int,
-        date: str,
-        recording: bool,
-        rendering: bool,
-        processing: bool,
-    ):
-        self.name = name
-        self.size = size
-        self.bytes = bytes
-        self.date = date
-        self.recording = recording
-        self.rendering = rendering
-        self.processing = processing
+    name: str
+    size: str
+    bytes: int
+    date: str
+    recording: bool
+    rendering: bool
+    processing: bool
 
 
+@dataclass(slots=True, eq=False)
 class TimelapseConfiguration:
-    def __init__(self, type: str, save: bool):
-        self.type = type
-        self.save = save
+    type: str
+    save: bool
 
 
+@dataclass(slots=True, eq=False)
 class TimelapseList:
-    def __init__(
-        self,
-        config: TimelapseConfiguration,
-        files: list = None,
-        unrendered: list = None,
-    ):
-        self.config = config
-        self.files = files
-        self.unrendered = unrendered
+    config: TimelapseConfiguration
+    files: list = None
+    unrendered: list = None
@@ -2,74 +2,104 @@
 This is a quick script to parse the `docs/api` folder of
 `github.com/OctoPrint/OctoPrint`. 
 """
+import functools
 import json
 import sys
 import os
+import re
 import argparse
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Format for the head of a python dataclass, followed by one line per field
+DATACLASS_FORMAT = """@dataclass({})
+class {}:
+"""
+
+# Format for the head of a `typing.NamedTuple`, followed by one line per field
+NAMEDTUPLE_FORMAT = """class {}(NamedTuple):
+"""
 
-# Format for a python class
+# Format for a python class taking arbitrary members as **kwargs, followed
+# by one line per assignment
 CLASS_FORMAT = """class {}:
     def __init__(self, {}):
-        {}
-
-
 """
 
-PARSE_KWARGS_FORMAT = """for k, v in kwargs:
-            setattr(self, k, v)"""
-
 # Format for parsing **kwargs if necessary
+PARSE_KWARGS_FORMAT = """        for k, v in kwargs.items():
+            setattr(self, k, v)
+"""
 
 
-
+# `.rst` type names and the python3 types they map to
+TYPE_CONVERTER = {
+    "String": "str",
+    "string": "str",
+    "url": "str",
+    "URL": "str",
+    "Object": "dict",
+    "object": "dict",
+    "boolean": "bool",
+    "Boolean": "bool",
+    "bool": "bool",
+    "Bool": "bool",
+    "int": "int",
+    "int or null": "int",
+    "Integer": "int",
+    "integer": "int",
+    "Number": "float",
+    "Number (Float)": "float",
+    "Float": "float",
+    "float": "float",
+    "list": "list",
+    "List": "list",
+    "Unix Timestamp": "int",
+    "Unix timestamp": "int",
+    "string or object": "dict",
+    "Printer state flags": "dict",
+}
+
+
+# member name in the first cell of a datamodel table row, e.g. "* - ``name``"
+NAME_RE = re.compile(r"``([^`]+)``")
+
+# target of a type reference, e.g. ":ref:`Name <target>" or ":ref:`target"
+REF_RE = re.compile(r":ref:`(?:[^`<]*<)?([^`>]+)")
+
+
+@functools.lru_cache(maxsize=512)
 def parse_type(type_str: str) -> str:
     """
     Parse a type string within a '.rst' file into the appropriate
-    python3 type.
+    python3 type. Results are cached, as the same few type strings
+    repeat across every file.
 
     params:
         type_str (str): type written in '.rst' file
 
-    Returns python type as string value.
+    Returns python type as string value. References to other datamodels
+    are returned as their reference key, e.g. ':ref:sec-api-datamodel:'.
     """
-    type_converter = {
-        "String": "str",
-        "string": "str",
-        "url": "str",
-        "URL": "str",
-        "Object": "dict",
-        "object": "dict",
-        "boolean": "bool",
-        "Boolean": "bool",
-        "bool": "bool",
-        "Bool": "bool",
-        "int": "int",
-        "int or null": "int",
-        "Integer": "int",
-        "integer": "int",
-        "Number": "float",
-        "Number (Float)": "float",
-        "Float": "float",
-        "float": "float",
-        "list": "list",
-        "List": "list",
-        "Unix Timestamp": "int",
-        "Unix timestamp": "int",
-        "string or object": "dict",
-        "Printer state flags": "dict",
-    }
-    if type_str.startswith("List of") or type_str.startswith("Array of"):
+    if type_str.startswith(("List of", "Array of")):
         return "list"
     if type_str.startswith("Map of") or type_str.endswith("or ``object"):
         return "dict"
     if type_str.startswith("String, "):
         return "str"
 
-    if type_str in type_converter.keys():
-        return type_converter[type_str]
+    if type_str in TYPE_CONVERTER:
+        return TYPE_CONVERTER[type_str]
     if type_str.startswith(":ref:"):
-        return type_str
+        match = REF_RE.match(type_str)
+        return f":ref:{match.group(1)}:" if match else type_str
     raise Exception(f"unsure how to parse type: '{type_str}'")
 
 
@@ -81,26 +111,21 @@ def parse_member(lines: list, i: int) -> (list, int):
         lines (list): list of lines from file
         i (int): current index of lines being processed
 
-    Returns a tuple of (member_data: dict, new_index: int)
+    Returns a tuple of ((name, type, description, optional), new_index: int)
     """
-    name = lines[i].split("``")[1].strip()
-    type_value = parse_type("-".join(lines[i + 2].split("-")[1:]).strip().strip("`"))
-    description = "-".join(lines[i + 3].split("-")[1:]).strip()
+    name = NAME_RE.search(lines[i]).group(1).strip()
+    type_value = parse_type(lines[i + 2].partition("-")[2].strip().strip("`"))
+    description = [lines[i + 3].partition("-")[2].strip()]
     j = 4
     while (
         i + j < len(lines)
         and not lines[i + j].strip().startswith("*")
         and not lines[i + j].strip() == ""
     ):
-        description += " " + lines[i + j].strip()
+        description.append(lines[i + j].strip())
         j += 1
     return (
-        {
-            "name": name,
-            "type": type_value,
-            "description": "-".join(lines[i + 3].split("-")[1:]).strip(),
-            "optional": (lines[i+1].split("-")[1].strip().startswith("0..")),
-        },
+        (name, type_value, " ".join(description), lines[i+1].split("-")[1].strip().startswith("0..")),
         i + j,
     )
 
@@ -122,26 +147,28 @@ def parse_class(lines: list, i: int, parent: dict = None) -> (list, int):
     while lines[i].strip() != "- Description":
         i += 1
     i += 1
+    members = []
     while True:
         new_member, i = parse_member(lines, i)
-        new_class["members"].append(new_member)
+        members.append(new_member)
         if i >= len(lines) or lines[i].strip() == "":
             break
 
-    names = [m["name"] for m in new_class["members"]]
-    for m in names:
-        if "." in m:
-            if m.split(".")[0] not in names:
-                new_class["members"].append(
-                    {
-                        "name": m.split(".")[0].replace("`", ""),
-                        "type": "dict",
-                        "description": None,
-                        "optional": True if True in [n.get("optional", False) for n in new_class["members"] if n["name"] == m] else False,
-                    }
-                )
-                names.append(m.split(".")[0])
-            new_class["members"] = [n for n in new_class["members"] if n["name"] != m]
+    by_name = {
+        n: {"name": n, "type": t, "description": d, "optional": o}
+        for n, t, d, o in members
+    }
+    for m in [n for n in by_name if "." in n]:
+        root = m.split(".")[0]
+        if root not in by_name:
+            by_name[root] = {
+                "name": root.replace("`", ""),
+                "type": "dict",
+                "description": None,
+                "optional": by_name[m].get("optional", False),
+            }
+        del by_name[m]
+    new_class["members"] = list(by_name.values())
 
     for m in new_class["members"]:
         if m["name"].endswith("{n}"):
@@ -159,6 +186,43 @@ def parse_class(lines: list, i: int, parent: dict = None) -> (list, int):
     return (new_class, i)
 
 
+def parse_file(path: str) -> list:
+    """
+    Parse all datamodels of a single '.rst' file.
+
+    params:
+        path (str): path of the '.rst' file
+
+    Returns a list of class_data dicts, each with its output python
+    filename set as "file".
+    """
+    filename = os.path.basename(path)
+    classes = []
+    parent = None
+    with open(path, "r") as f:
+        lines = f.read().splitlines()
+    i = 0
+    delimiter = "-----" if filename != "access.rst" else "~~~~~"
+    subclass_delimiter = "'''''"
+    classifier = re.compile(rf"^({re.escape(delimiter)})|^({re.escape(subclass_delimiter)})")
+    while i < len(lines):
+        match = classifier.match(lines[i])
+        if match is None:
+            i += 1
+        elif match.group(1):
+            new_class, i = parse_class(lines, i)
+            classes.append(new_class)
+            parent = new_class
+        else:
+            new_class, i = parse_class(lines, i, parent=parent)
+            classes.append(new_class)
+
+    python_filename = filename.replace(".rst", ".py")
+    for j in classes:
+        j["file"] = python_filename
+    return classes
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="create python3 classes from  `github.com:OctoPrint/Octoprint/docs/api/`"
@@ -167,8 +231,14 @@ def main():
         "-j",
         "--json-filename",
         type=str,
-        default="all_datamodels.json",
-        help="name for json file containing class data",
+        default=None,
+        help="name for json file containing class data, written only if given",
+    )
+    parser.add_argument(
+        "-n",
+        "--namedtuple",
+        action="store_true",
+        help="write datamodels without subclasses as `typing.NamedTuple`s",
     )
     parser.add_argument(
         "-f", "--force", action="store_true", help="force overwriting of `output_dir`"
@@ -188,98 +258,123 @@ def main():
             shutil.rmtree(args.output_dir)
         os.makedirs(args.output_dir)
 
-        if os.path.isfile(os.path.join(args.output_dir, args.json_filename)):
-            os.remove(os.path.join(args.output_dir, args.json_filename))
-
         """
         Go through each file in `api_docs` and parse classes and
-        their members, write data to `json_filename`.
+        their members, write data to `json_filename` if requested.
         """
-        for filename in os.listdir(args.api_docs):
-            classes = []
-            with open(os.path.join(args.api_docs, filename), "r") as f:
-                lines = f.readlines()
-                i = 0
-                delimiter = "-----" if filename != "access.rst" else "~~~~~"
-                subclass_delimiter = "'''''"
-                while i < len(lines):
-                    if lines[i].startswith(delimiter):
-                        new_class, i = parse_class(lines, i)
-                        classes.append(new_class)
-                        parent = -1
-                    elif lines[i].startswith(subclass_delimiter):
-                        new_class, i = parse_class(lines, i, parent = classes[parent])
-                        classes.append(new_class)
-                        parent -= 1
-                    else:
-                        i += 1
-
-            if len(classes) == 0:
-                continue
-
-            python_filename = filename.replace(".rst", ".py")
-
-            json_classes = classes
-            for j in json_classes:
-                j["file"] = python_filename
-
-            if os.path.isfile(os.path.join(args.output_dir, args.json_filename)):
-                with open(os.path.join(args.output_dir, args.json_filename), "r") as f:
-                    json_classes += json.load(f)
-
-            with open(os.path.join(args.output_dir, args.json_filename), "w") as f:
-                json.dump(json_classes, f)
+        with os.scandir(args.api_docs) as entries:
+            paths = [e.path for e in entries if e.name.endswith(".rst") and e.is_file()]
+        all_json_data = []
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            for classes in executor.map(parse_file, paths):
+                all_json_data.extend(classes)
+
+        if args.json_filename:
+            with open(os.path.join(args.output_dir, args.json_filename), "wb") as f:
+                if orjson is not None:
+                    f.write(orjson.dumps(all_json_data))
+                else:
+                    f.write(json.dumps(all_json_data).encode())
 
         """
-        Go through `json_filename` data, resolve any type references to other
+        Go through the parsed class data, resolve any type references to other
         datamodels, then write to files.
         """
-        with open(os.path.join(args.output_dir, args.json_filename), "r") as f:
-            all_json_data = json.load(f)
 
         references = {}
         for c in all_json_data:
             if "reference" in c.keys():
                 references[c["reference"]] = (c["name"], c["file"])
 
-        # sort so classes with references come last in file
-        all_json_data = sorted(all_json_data, key=lambda c: (True in [m["type"].startswith(":ref:") for m in c["members"] if m["type"]]))
+        # group classes by file, sorted so classes with references come last in file
+        all_json_data.sort(
+            key=lambda c: (c["file"], any(m["type"] and m["type"].startswith(":ref:") for m in c["members"]))
+        )
 
         for c in all_json_data:
             for m in c["members"]:
                 if m["type"] and m["type"].startswith(":ref:"):
-                    if "<" in m["type"]:
-                        type_ref = ":ref:" + m["type"].split("<")[1].split(">")[0] + ":"
-                    else:
-                        type_ref = ":ref:" + m["type"].split("`")[1] + ":"
-                    if type_ref not in references.keys():
+                    if m["type"] not in references:
                         raise Exception(
                             f"unresolved class type reference: '{m['type']}'"
                         )
-                    m["type"] = references[type_ref][0]
-
-        for c in all_json_data:
-            with open(os.path.join(args.output_dir, c["file"]), "a") as f:
-                if f.tell() == 0 and c["file"] != "datamodel.py":
+                    m["type"] = references[m["type"]][0]
+
+        # classes taking arbitrary `**kwargs` members, and their subclasses,
+        # are written as plain classes; all others as slotted dataclasses
+        plain_classes = {
+            c["name"] for c in all_json_data if any(m["type"] is None for m in c["members"])
+        }
+        plain_classes.update(c["name"] for c in all_json_data if c.get("parent") in plain_classes)
+        # with `--namedtuple`, other classes outside of any class hierarchy
+        # are written as named tuples, unless a member name starts with an
+        # underscore, which `NamedTuple` does not allow
+        tuple_classes = set()
+        if args.namedtuple:
+            parents = {c["parent"] for c in all_json_data if c.get("parent")}
+            tuple_classes = {
+                c["name"]
+                for c in all_json_data
+                if not c.get("parent")
+                and c["name"] not in parents | plain_classes
+                and not any(m["name"].startswith("_") for m in c["members"])
+            }
+
+        for filename, file_classes in groupby(all_json_data, key=itemgetter("file")):
+            file_classes = list(file_classes)
+            with open(os.path.join(args.output_dir, filename), "w") as f:
+                kinds = {
+                    "plain" if c["name"] in plain_classes
+                    else "tuple" if c["name"] in tuple_classes
+                    else "dataclass"
+                    for c in file_classes
+                }
+                if "dataclass" in kinds:
+                    f.write("from dataclasses import dataclass\n")
+                if "tuple" in kinds:
+                    f.write("from typing import NamedTuple\n")
+                if kinds != {"plain"}:
+                    f.write("\n")
+                if filename != "datamodel.py":
                     f.write("from .datamodel import *\n\n")
-                constructor_args = ", ".join(
-                    [m["name"] + (" : " + m["type"] if m["type"] else "") + (" = None" if m.get("optional", False) else "") for m in c["members"]]
-                )
-                assignments = f"\n        ".join(
-                    [f"self.{m['name']} = {m['name']}" for m in c["members"]]
-                )
-                if assignments == "self.**kwargs = **kwargs":
-                    assignments = PARSE_KWARGS_FORMAT
-                if c.get("parent"):
-                    assignments += "\n        super().__init__(**kwargs)"
-                    constructor_args += ", **kwargs"
-                f.write(
-                    CLASS_FORMAT.format(
-                        c["name"] + (f"({c['parent']})" if c.get('parent') else ""),
-                        constructor_args,
-                        assignments,
-                    )
-                )
+                for c in file_classes:
+                    class_name = c["name"] + (f"({c['parent']})" if c.get("parent") else "")
+                    if c["name"] not in plain_classes:
+                        if c["name"] in tuple_classes:
+                            head = NAMEDTUPLE_FORMAT.format(class_name)
+                        else:
+                            # eq=False keeps identity equality and hashing,
+                            # as on the records in the package
+                            options = (
+                                "slots=True, eq=False, kw_only=True"
+                                if c.get("parent")
+                                else "slots=True, eq=False"
+                            )
+                            head = DATACLASS_FORMAT.format(options, class_name)
+                        f.writelines([
+                            head,
+                            *(
+                                f"    {m['name']}: {m['type']}" + (" = None\n" if m.get("optional", False) else "\n")
+                                for m in c["members"]
+                            ),
+                            "\n\n",
+                        ])
+                        continue
+
+                    members = [m for m in c["members"] if m["type"] is not None]
+                    takes_kwargs = len(members) < len(c["members"])
+                    constructor_args = [
+                        m["name"] + " : " + m["type"] + (" = None" if m.get("optional", False) else "") for m in members
+                    ]
+                    if takes_kwargs or c.get("parent"):
+                        constructor_args.append("**kwargs")
+                    f.writelines([
+                        CLASS_FORMAT.format(class_name, ", ".join(constructor_args)),
+                        *(f"        self.{m['name']} = {m['name']}\n" for m in members),
+                        PARSE_KWARGS_FORMAT if takes_kwargs else "",
+                        "        super().__init__(**kwargs)\n" if c.get("parent") else "",
+                        "\n\n",
+                    ])
     except Exception as e:
         raise (e)
         print(f"[!] Failed: {e}", file=sys.stderr)